@@ -1,181 +1,349 @@
+import io
 import os
+import re
+import csv
 import sys
-import json
+import queue
+import atexit
+import asyncio
+import argparse
 import logging
-from datetime import datetime, timedelta
+import functools
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime
+from itertools import chain, islice
+import httpx
+import orjson
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 from dotenv import load_dotenv
-from supabase import create_client, Client
 from unusual_whales_api import get_analyst_ratings
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("logs/analyst_ratings_fetcher.log")
-    ]
+# Configure logging. Records are formatted on the calling thread and handed
+# to a QueueListener, which does the console/file writes in the background.
+log_queue = queue.Queue(-1)
+log_handler = QueueHandler(log_queue)
+log_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+log_listener = QueueListener(
+    log_queue,
+    logging.StreamHandler(),
+    logging.FileHandler("logs/analyst_ratings_fetcher.log")
 )
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logger = logging.getLogger("analyst_ratings_fetcher")
+logger.setLevel(logging.INFO)
+logger.addHandler(log_handler)
+logger.propagate = False
 
 # Load environment variables
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# Direct Postgres DSN, only needed for bulk (COPY) loads
+SUPABASE_DB_URL = os.getenv("SUPABASE_DB_URL")
+
+# Columns that identify a unique rating (backed by idx_analyst_ratings_dedup)
+DEDUP_COLUMNS = "symbol,firm,rating_date,rating_change"
+
+# Column order used when loading ratings with COPY
+RATING_COLUMNS = (
+    "symbol", "company_name", "firm", "analyst", "rating_date",
+    "old_rating", "new_rating", "rating_change",
+    "old_price_target", "new_price_target", "price_target_change_percent",
+    "current_price", "created_at", "updated_at"
+)
+
+# Default number of rows per insert request
+DEFAULT_BATCH_SIZE = 500
+
+# Upper bound for a single insert body (Supabase rejects bodies over ~1 MB)
+MAX_REQUEST_BYTES = 800_000
+
+# Below this many rows a bulk load falls back to the REST upsert
+BULK_MIN_ROWS = 200
+
+# Default number of insert batches in flight against Supabase at once
+MAX_CONCURRENT_BATCHES = 8
+
+# Timeouts for the keep-alive connection pool used by store()
+HTTP_TIMEOUT = httpx.Timeout(30, pool=30)
+
+# Gateway errors from Supabase that are worth retrying
+TRANSIENT_STATUS_CODES = {502, 503, 504}
+
+# Rating dates arrive already formatted as YYYY-MM-DD
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+@functools.lru_cache(maxsize=1)
+def _supabase_config():
+    """Return the (url, key) pair for Supabase, validated on first use."""
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
+    return url, key
+
+
+def _is_transient_error(exc):
+    """Return True for network errors and gateway failures worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
 
 
 class AnalystRatingsFetcher:
-    def __init__(self):
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, concurrency=MAX_CONCURRENT_BATCHES):
         self.table_name = "analyst_ratings"
+        self.batch_size = batch_size
+        self.concurrency = concurrency
     
     def fetch(self, days=14, limit=500):
         """Fetch analyst ratings from the Unusual Whales API."""
-        logger.info(f"Fetching analyst ratings for the past {days} days (limit: {limit})...")
+        logger.info("Fetching analyst ratings for the past %d days (limit: %d)...", days, limit)
         
         try:
             ratings = get_analyst_ratings(days=days, limit=limit)
-            logger.info(f"Successfully fetched {len(ratings)} analyst ratings")
+            logger.info("Successfully fetched %d analyst ratings", len(ratings))
             return ratings
         
         except Exception as e:
-            logger.error(f"Error fetching analyst ratings: {e}")
+            logger.error("Error fetching analyst ratings: %s", e)
             return []
     
     def process(self, ratings):
-        """Process the fetched analyst ratings data."""
+        """Process the fetched analyst ratings data, yielding one row per rating."""
         logger.info("Processing analyst ratings data...")
         
-        processed_ratings = []
+        # The whole batch shares one ingestion timestamp
+        now = datetime.now()
+        now_iso = now.isoformat()
+        today_str = now.strftime("%Y-%m-%d")
+        
+        # Fields shared by every row; each rating fills in the rest
+        template = {"created_at": now_iso, "updated_at": now_iso}
+        
+        count = 0
+        seen = set()
+        seen_add = seen.add
+        date_match = _DATE_RE.match
         for rating in ratings:
-            # Convert date string to proper format
-            try:
-                date_obj = datetime.strptime(rating["rating_date"], "%Y-%m-%d")
-                rating_date = date_obj.strftime("%Y-%m-%d")
-            except (ValueError, TypeError):
-                # If date parsing fails, use current date
-                rating_date = datetime.now().strftime("%Y-%m-%d")
+            # Keep well-formed dates as-is, otherwise fall back to the current date
+            rating_date = rating.get("rating_date")
+            if not isinstance(rating_date, str) or not date_match(rating_date):
+                rating_date = today_str
             
-            processed_ratings.append({
-                "symbol": rating["symbol"],
-                "company_name": rating["company_name"],
-                "firm": rating["firm"],
-                "analyst": rating["analyst"],
-                "rating_date": rating_date,
-                "old_rating": rating["old_rating"],
-                "new_rating": rating["new_rating"],
-                "rating_change": rating["rating_change"],
-                "old_price_target": rating["old_price_target"],
-                "new_price_target": rating["new_price_target"],
-                "price_target_change_percent": rating["price_target_change_percent"],
-                "current_price": rating["current_price"],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            })
-        
-        logger.info(f"Processed {len(processed_ratings)} analyst ratings")
-        return processed_ratings
-    
-    def store(self, processed_ratings):
-        """Store the processed analyst ratings in Supabase."""
-        if not processed_ratings:
-            logger.warning("No ratings to store")
-            return
+            # Skip ratings repeated within this fetch (same key as DEDUP_COLUMNS)
+            key = f"{rating['symbol']}\x1f{rating['firm']}\x1f{rating_date}\x1f{rating['rating_change']}"
+            if key in seen:
+                continue
+            seen_add(key)
+            
+            count += 1
+            row = template.copy()
+            row.update(
+                symbol=rating["symbol"],
+                company_name=rating["company_name"],
+                firm=rating["firm"],
+                analyst=rating["analyst"],
+                rating_date=rating_date,
+                old_rating=rating["old_rating"],
+                new_rating=rating["new_rating"],
+                rating_change=rating["rating_change"],
+                old_price_target=rating["old_price_target"],
+                new_price_target=rating["new_price_target"],
+                price_target_change_percent=rating["price_target_change_percent"],
+                current_price=rating["current_price"]
+            )
+            yield row
         
-        logger.info(f"Storing {len(processed_ratings)} analyst ratings in Supabase...")
+        logger.info("Processed %d analyst ratings", count)
+    
+    def store(self, processed_ratings, bulk=False):
+        """Store the processed analyst ratings in Supabase.
         
+        processed_ratings may be any iterable, such as the generator returned
+        by process(); it is consumed in a single pass. With bulk=True the
+        ratings are loaded with a single COPY over a direct Postgres
+        connection (requires SUPABASE_DB_URL), unless there are fewer than
+        BULK_MIN_ROWS of them.
+        """
         try:
-            # Get existing ratings from the last 14 days to avoid duplicates
-            fourteen_days_ago = (datetime.now() - timedelta(days=14)).strftime("%Y-%m-%d")
-            
-            existing_ratings = supabase.table(self.table_name) \
-                .select("symbol, firm, rating_date, rating_change") \
-                .gte("rating_date", fourteen_days_ago) \
-                .execute()
+            rating_iter = iter(processed_ratings)
+            if bulk:
+                # A small delta is cheaper as a plain upsert than a
+                # connection + staging table + merge
+                head = list(islice(rating_iter, BULK_MIN_ROWS))
+                rating_iter = chain(head, rating_iter)
+                if len(head) >= BULK_MIN_ROWS:
+                    stored = self._store_bulk(rating_iter)
+                    logger.info("Successfully bulk loaded %d new analyst ratings", stored)
+                    return
+                logger.info("Only %d ratings to store, skipping bulk load", len(head))
             
-            # Create a set of existing ratings (symbol, firm, date, change) for efficient lookup
-            existing_set = set()
-            for item in existing_ratings.data:
-                key = (
-                    item["symbol"],
-                    item["firm"],
-                    item["rating_date"],
-                    item["rating_change"]
-                )
-                existing_set.add(key)
+            # Insert data in batches to avoid hitting API limits. Duplicates are
+            # skipped by the database via the unique index on DEDUP_COLUMNS.
+            first_rating = next(rating_iter, None)
+            if first_rating is None:
+                logger.warning("No ratings to store")
+                return
             
-            # Filter out duplicates
-            new_ratings = []
-            for rating in processed_ratings:
-                key = (
-                    rating["symbol"],
-                    rating["firm"],
-                    rating["rating_date"],
-                    rating["rating_change"]
-                )
-                if key not in existing_set:
-                    new_ratings.append(rating)
+            batch_size = self._effective_batch_size(first_rating)
+            rating_iter = chain([first_rating], rating_iter)
+            # Batches are cut from the ratings only as they are sent
+            batches = iter(lambda: list(islice(rating_iter, batch_size)), [])
             
-            logger.info(f"Found {len(processed_ratings) - len(new_ratings)} duplicate ratings")
+            logger.info("Storing analyst ratings in Supabase in batches of %d...", batch_size)
+            stored = asyncio.run(self._store_async(batches))
             
-            if not new_ratings:
-                logger.info("No new ratings to insert")
-                return
+            logger.info("Successfully stored %d analyst ratings", stored)
+        
+        except Exception as e:
+            logger.error("Error storing analyst ratings: %s", e)
+    
+    def _effective_batch_size(self, sample_rating):
+        """Cap the configured batch size so request bodies stay under MAX_REQUEST_BYTES."""
+        row_bytes = len(orjson.dumps(sample_rating))
+        return max(1, min(self.batch_size, MAX_REQUEST_BYTES // row_bytes))
+    
+    async def _store_async(self, batches):
+        """Upsert batches concurrently through the Supabase REST API.
+        
+        batches may be a lazy iterator: each of the `concurrency` workers
+        takes the next batch only once its previous one is sent, so at most
+        that many batches are held in memory.
+        """
+        supabase_url, supabase_key = _supabase_config()
+        url = f"{supabase_url}/rest/v1/{self.table_name}"
+        headers = {
+            "apikey": supabase_key,
+            "Authorization": f"Bearer {supabase_key}",
+            "Content-Type": "application/json",
+            "Prefer": "resolution=ignore-duplicates,return=minimal"
+        }
+        params = {"on_conflict": DEDUP_COLUMNS}
+        # Keep-alive pool shared by all batches, sized to the concurrency
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency,
+            keepalive_expiry=30
+        )
+        
+        async with httpx.AsyncClient(headers=headers, limits=limits, timeout=HTTP_TIMEOUT) as client:
+            # Shared by the workers; each next() runs between awaits
+            numbered_batches = enumerate(batches, 1)
             
-            # Insert data in batches to avoid hitting API limits
-            batch_size = 50
-            for i in range(0, len(new_ratings), batch_size):
-                batch = new_ratings[i:i+batch_size]
-                response = supabase.table(self.table_name).insert(batch).execute()
-                
-                if hasattr(response, 'error') and response.error:
-                    logger.error(f"Error inserting batch {i//batch_size + 1}: {response.error}")
-                else:
-                    logger.info(f"Successfully inserted batch {i//batch_size + 1} ({len(batch)} ratings)")
+            async def insert_batches():
+                stored = 0
+                for batch_number, batch in numbered_batches:
+                    # Serialize once with orjson and send the raw body
+                    body = orjson.dumps(batch)
+                    try:
+                        response = await self._insert_batch(client, url, params, body)
+                    except httpx.HTTPError as e:
+                        logger.error("Error inserting batch %d: %s", batch_number, e)
+                        continue
+                    
+                    if response.is_error:
+                        logger.error("Error inserting batch %d: %s", batch_number, response.text)
+                        continue
+                    
+                    logger.info("Successfully inserted batch %d (%d ratings)", batch_number, len(batch))
+                    stored += len(batch)
+                return stored
             
-            logger.info(f"Successfully stored {len(new_ratings)} new analyst ratings")
+            results = await asyncio.gather(*(insert_batches() for _ in range(self.concurrency)))
         
-        except Exception as e:
-            logger.error(f"Error storing analyst ratings: {e}")
+        return sum(results)
+    
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_exponential_jitter(),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True
+    )
+    async def _insert_batch(self, client, url, params, body):
+        """POST one serialized batch, retrying timeouts and gateway errors."""
+        response = await client.post(url, params=params, content=body)
+        if response.status_code in TRANSIENT_STATUS_CODES:
+            response.raise_for_status()
+        return response
+    
+    def _store_bulk(self, processed_ratings):
+        """COPY ratings into a staging table and merge them, skipping duplicates."""
+        import psycopg2
+        
+        if not SUPABASE_DB_URL:
+            raise ValueError("SUPABASE_DB_URL must be set for bulk loads")
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        row_count = 0
+        for rating in processed_ratings:
+            writer.writerow([rating[column] for column in RATING_COLUMNS])
+            row_count += 1
+        
+        if not row_count:
+            logger.warning("No ratings to store")
+            return 0
+        
+        logger.info("Bulk loading %d analyst ratings into Supabase...", row_count)
+        buffer.seek(0)
+        
+        columns = ", ".join(RATING_COLUMNS)
+        conn = psycopg2.connect(SUPABASE_DB_URL)
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute(
+                    f"CREATE TEMP TABLE {self.table_name}_staging "
+                    f"(LIKE public.{self.table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                cur.copy_expert(
+                    f"COPY {self.table_name}_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+                cur.execute(
+                    f"INSERT INTO public.{self.table_name} ({columns}) "
+                    f"SELECT {columns} FROM {self.table_name}_staging "
+                    f"ON CONFLICT ({DEDUP_COLUMNS}) DO NOTHING"
+                )
+                return cur.rowcount
+        finally:
+            conn.close()
     
-    def run(self, days=14, limit=500):
+    def run(self, days=14, limit=500, bulk=False):
         """Run the full fetcher process."""
         logger.info("Starting Analyst Ratings Fetcher...")
         
         try:
             ratings = self.fetch(days, limit)
             processed_ratings = self.process(ratings)
-            self.store(processed_ratings)
+            self.store(processed_ratings, bulk=bulk)
             logger.info("Analyst Ratings Fetcher completed successfully")
             return True
         
         except Exception as e:
-            logger.error(f"Error running Analyst Ratings Fetcher: {e}")
+            logger.error("Error running Analyst Ratings Fetcher: %s", e)
             return False
 
 
 if __name__ == "__main__":
     # Parse command line arguments
-    days = 14
-    limit = 500
-    
-    if len(sys.argv) > 1:
-        try:
-            days = int(sys.argv[1])
-        except ValueError:
-            logger.warning(f"Invalid days value: {sys.argv[1]}. Using default: {days}")
-    
-    if len(sys.argv) > 2:
-        try:
-            limit = int(sys.argv[2])
-        except ValueError:
-            logger.warning(f"Invalid limit value: {sys.argv[2]}. Using default: {limit}")
+    parser = argparse.ArgumentParser(description="Fetch analyst ratings and store them in Supabase")
+    parser.add_argument("--days", type=int, default=14,
+                        help="Number of days of ratings to fetch")
+    parser.add_argument("--limit", type=int, default=500,
+                        help="Maximum number of ratings to fetch")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Number of rows per insert request")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_BATCHES,
+                        help="Number of insert requests in flight at once")
+    parser.add_argument("--bulk", action="store_true",
+                        help="Load with a single COPY over SUPABASE_DB_URL")
+    args = parser.parse_args()
     
     # Run the fetcher
-    fetcher = AnalystRatingsFetcher()
-    success = fetcher.run(days, limit)
+    fetcher = AnalystRatingsFetcher(batch_size=args.batch_size, concurrency=args.concurrency)
+    success = fetcher.run(args.days, args.limit, bulk=args.bulk)
     
     # Exit with appropriate code
-    sys.exit(0 if success else 1) 
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -1,27 +1,32 @@
 import asyncio
 import logging
-import json
+import orjson
 import os
-import time
-from datetime import datetime, timedelta
-import requests
+import re
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import httpx
 import imaplib
 import email
 from email.header import decode_header
-import pdfplumber
-import io
-from bs4 import BeautifulSoup
+from email.utils import parseaddr
+import pypdfium2 as pdfium
+from urllib.parse import urljoin
+from selectolax.lexbor import LexborHTMLParser
+from diskcache import Cache
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from json_logging import json_log_handler
+from tenacity import retry, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_exponential
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 
 # Configure logging
 logger = logging.getLogger("bank-reports-fetcher")
-logging.basicConfig(
-    level=logging.INFO,
-    format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "component": "%(name)s", "message": "%(message)s", "metadata": %(metadata)s}',
-    handlers=[logging.StreamHandler()]
-)
+logging.basicConfig(level=logging.INFO, handlers=[json_log_handler()])
 
 # Load environment variables
 load_dotenv()
@@ -41,6 +46,59 @@ BANK_REPORTS_TABLE = "bank_reports"
 DATA_DIR = os.path.join("reports", "banks")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Reports are processed from memory; local copies are only kept when debugging
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# HTTP settings for scraping bank websites
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+REQUEST_TIMEOUT = 30
+MAX_CONCURRENT_REQUESTS = 16
+
+# Persistent cache of page validators/links and already-processed PDF digests
+report_cache = Cache(os.path.join(".cache", "bank_reports"))
+PAGE_CACHE_EXPIRY = 7 * 24 * 3600  # Revalidate bank pages for up to a week
+
+# Response statuses worth retrying a download for; other errors (such as a
+# 404 for a moved report) fail straight away
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Concurrent Gemini requests, kept low to respect the API rate limits
+MAX_CONCURRENT_AI_REQUESTS = 4
+GEMINI_MODEL = "gemini-1.5-pro"
+GEMINI_GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0}
+
+# Only the start of a report is sent to the AI, so stop extracting after this
+MAX_REPORT_CHARS = 15000
+
+# PDF extraction strategy by page count (first matching upper bound wins):
+# PDFs are parsed in a worker thread, except very large ones, which go to a
+# separate process
+PDF_EXTRACTION_RULES = [
+    (500, "thread"),
+    (None, "process")
+]
+PDF_PROCESS_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# Report classification patterns, compiled once so each subject/title is
+# scanned in a single pass instead of once per keyword
+EARNINGS_EMAIL_KEYWORDS = [
+    "earnings", "financial results", "quarterly results", "q1", "q2", "q3", "q4",
+    "financial report", "annual report", "quarterly report"
+]
+_EARNINGS_EMAIL_RE = re.compile("|".join(map(re.escape, EARNINGS_EMAIL_KEYWORDS)))
+_QUARTERLY_RE = re.compile(r"q[1-4]|quarter")
+_QUARTER_RE = re.compile(r"q[1-4]")
+_ANNUAL_RE = re.compile(r"annual|yearly|full year")
+_YEAR_RE = re.compile(r"20[12]\d")
+
+# Markdown code fence (``` or ~~~, optionally tagged json) around an AI response
+_FENCE_RE = re.compile(r"(```|~~~)(?:json)?\s*(.*?)\s*\1", re.DOTALL | re.IGNORECASE)
+
+# Link text terms that mark a PDF link on a bank's page as a report
+REPORT_LINK_TERMS = ("quarter", "earnings", "results", "financial", "report")
+
 # Banks we want to track
 TRACKED_BANKS = [
     {"name": "JP Morgan", "domain": "jpmorgan.com", "url": "https://www.jpmorganchase.com/ir/quarterly-earnings"},
@@ -51,24 +109,103 @@ TRACKED_BANKS = [
     {"name": "Citigroup", "domain": "citigroup.com", "url": "https://www.citigroup.com/global/investors/quarterly-earnings"}
 ]
 
+# Bank name by email domain, for matching senders without scanning every bank
+BANK_BY_DOMAIN = {bank["domain"]: bank["name"] for bank in TRACKED_BANKS if bank["domain"]}
+
+def _is_transient_error(exc):
+    """Return True for network errors, rate limiting and server failures worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+def _bank_for_domain(domain):
+    """Return the tracked bank for a sender domain or any of its parent domains."""
+    labels = domain.split(".")
+    for i in range(len(labels) - 1):
+        bank_name = BANK_BY_DOMAIN.get(".".join(labels[i:]))
+        if bank_name:
+            return bank_name
+    return None
+
+# PDFium is not thread-safe, even across documents, so every call into it
+# within a process is serialized. Process pool workers each have their own.
+_PDFIUM_LOCK = threading.Lock()
+
+def _pdf_document_text(pdf, max_chars):
+    """Extract page text from an open PDFium document, stopping after max_chars.
+    
+    Callers must hold _PDFIUM_LOCK.
+    """
+    pages = []
+    total_chars = 0
+    for index in range(len(pdf)):
+        # Close page handles here rather than leaving them to the garbage
+        # collector, which could run outside the lock
+        page = pdf[index]
+        textpage = page.get_textpage()
+        try:
+            page_text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        if page_text:
+            pages.append(page_text)
+            total_chars += len(page_text)
+            if total_chars >= max_chars:
+                break
+    return "\n\n".join(pages)
+
+def _read_pdf_text(pdf_bytes, max_chars=MAX_REPORT_CHARS):
+    """Extract page text using PDFium (native code), stopping after max_chars."""
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            return _pdf_document_text(pdf, max_chars)
+        finally:
+            pdf.close()
+
+def _read_pdf_text_unless_large(pdf_bytes, max_chars=MAX_REPORT_CHARS):
+    """Open a PDF once and extract its text unless it needs a separate process.
+    
+    Returns (page_count, text); text is None for PDFs whose strategy is
+    "process".
+    """
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            page_count = len(pdf)
+            if _pdf_extraction_strategy(page_count) == "process":
+                return page_count, None
+            return page_count, _pdf_document_text(pdf, max_chars)
+        finally:
+            pdf.close()
+
+def _pdf_extraction_strategy(page_count):
+    """Pick the extraction strategy for a PDF from PDF_EXTRACTION_RULES."""
+    for max_pages, strategy in PDF_EXTRACTION_RULES:
+        if max_pages is None or page_count <= max_pages:
+            return strategy
+
 class BankReportsFetcher:
     def __init__(self):
         """Initialize the bank reports fetcher."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        # The HTTP session and request semaphore are bound to the running
+        # event loop, so they are created on first use and closed by run()
+        self._session = None
+        self._sem = None
+        self._ai_sem = None
+        self._process_pool = None
+        self._gemini = genai.GenerativeModel(GEMINI_MODEL, generation_config=GEMINI_GENERATION_CONFIG)
+        self._bucket_ready = set()  # Storage buckets known to exist
+        self._seen_digests = set()  # PDF content hashes handled this run
         
     async def run(self):
         """Run the complete bank reports fetching process."""
         try:
             logger.info("Starting bank reports fetching process", extra={"metadata": {}})
             
-            # First try to fetch via email
-            await self.fetch_reports_via_email()
-            
-            # Then try to scrape from websites
-            await self.fetch_reports_via_web()
+            # Fetch via email and scrape the bank websites concurrently
+            await asyncio.gather(self.fetch_reports_via_email(), self.fetch_reports_via_web())
             
             logger.info("Completed bank reports fetching process", extra={"metadata": {}})
             return True
@@ -76,6 +213,130 @@ class BankReportsFetcher:
             logger.error(f"Error in bank reports fetching process: {str(e)}", 
                        extra={"metadata": {"error": str(e)}})
             return False
+        finally:
+            await self.close()
+    
+    async def close(self):
+        """Close the HTTP session and the PDF process pool."""
+        if self._session is not None and not self._session.is_closed:
+            await self._session.aclose()
+        self._session = None
+        self._sem = None
+        self._ai_sem = None
+        self._seen_digests.clear()
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
+    def _ai_semaphore(self):
+        """Return the semaphore bounding concurrent AI requests."""
+        if self._ai_sem is None:
+            self._ai_sem = asyncio.Semaphore(MAX_CONCURRENT_AI_REQUESTS)
+        return self._ai_sem
+    
+    def _get_process_pool(self):
+        """Return the process pool used for very large PDFs, creating it on first use."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=PDF_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+    
+    async def _get_session(self):
+        """Return the shared HTTP/2 client, creating it inside the running loop."""
+        if self._session is None or self._session.is_closed:
+            self._session = httpx.AsyncClient(
+                http2=True,
+                headers=HEADERS,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30),
+                timeout=REQUEST_TIMEOUT,
+                follow_redirects=True
+            )
+            self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        return self._session
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True
+    )
+    async def _fetch(self, url):
+        """Download a URL and return the response body as bytes."""
+        session = await self._get_session()
+        async with self._sem:
+            async with session.stream("GET", url) as response:
+                response.raise_for_status()
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                return bytes(body)
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception(_is_transient_error),
+        reraise=True
+    )
+    async def _fetch_if_modified(self, url, validators):
+        """Conditionally download a URL using cached ETag/Last-Modified validators.
+        
+        Returns (body, validators); body is None if the server answered 304.
+        """
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        
+        session = await self._get_session()
+        async with self._sem:
+            response = await session.get(url, headers=headers)
+            if response.status_code == 304:
+                return None, validators
+            response.raise_for_status()
+            return response.content, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified")
+            }
+    
+    async def _process_pdf_bytes(self, pdf_bytes, file_path, bank_name, source, title, source_url=None):
+        """Process a PDF unless identical content was already processed."""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        
+        # The same PDF can be linked by several banks or arrive by email and
+        # web in the same run, so claim the digest before any await
+        if digest in self._seen_digests:
+            logger.info(f"Identical PDF already handled in this run, skipping: {file_path}", 
+                       extra={"metadata": {"file": file_path, "sha256": digest}})
+            return
+        self._seen_digests.add(digest)
+        
+        cache_key = f"pdf:{digest}"
+        if cache_key in report_cache:
+            logger.info(f"Identical PDF already processed, skipping: {file_path}", 
+                       extra={"metadata": {"file": file_path, "report_id": report_cache.get(cache_key)}})
+            return
+        
+        # Fall back to the database when the local cache doesn't know the PDF
+        existing_id = await self._report_id_for_digest(digest)
+        if existing_id:
+            logger.info(f"Identical PDF already stored, skipping: {file_path}", 
+                       extra={"metadata": {"file": file_path, "report_id": existing_id}})
+            report_cache.set(cache_key, existing_id)
+            return
+        
+        # Keep a local copy only when debugging
+        if DEBUG:
+            with open(file_path, 'wb') as f:
+                f.write(pdf_bytes)
+        
+        # Process the report
+        report_id = await self.process_report(pdf_bytes, file_path, bank_name, source, title, digest, source_url)
+        if report_id:
+            report_cache.set(cache_key, report_id)
             
     async def fetch_reports_via_email(self):
         """Fetch reports from email inbox."""
@@ -85,10 +346,11 @@ class BankReportsFetcher:
             return
             
         try:
-            # Connect to the email server
-            mail = imaplib.IMAP4_SSL(EMAIL_SERVER)
-            mail.login(EMAIL_USER, EMAIL_PASS)
-            mail.select("inbox")
+            # Connect to the email server. imaplib is blocking, so each IMAP
+            # command runs in a worker thread to keep the event loop free
+            mail = await asyncio.to_thread(imaplib.IMAP4_SSL, EMAIL_SERVER)
+            await asyncio.to_thread(mail.login, EMAIL_USER, EMAIL_PASS)
+            await asyncio.to_thread(mail.select, "inbox")
             
             # Search for unread emails from banks
             search_query = 'UNSEEN'
@@ -96,7 +358,7 @@ class BankReportsFetcher:
                 if bank["domain"]:
                     search_query += f' OR FROM "@{bank["domain"]}"'
                     
-            status, messages = mail.search(None, search_query)
+            status, messages = await asyncio.to_thread(mail.search, None, search_query)
             
             if status != 'OK':
                 logger.warning("Failed to search emails", extra={"metadata": {"status": status}})
@@ -106,13 +368,18 @@ class BankReportsFetcher:
             logger.info(f"Found {len(email_ids)} potential bank report emails", 
                        extra={"metadata": {"count": len(email_ids)}})
             
-            for email_id in email_ids:
-                status, msg_data = mail.fetch(email_id, '(RFC822)')
-                
-                if status != 'OK':
-                    continue
-                    
-                raw_email = msg_data[0][1]
+            # Fetch all candidate messages in one round-trip. BODY.PEEK[]
+            # leaves the \Seen flag alone, so only processed emails get marked
+            fetched = []
+            if email_ids:
+                status, msg_data = await asyncio.to_thread(mail.fetch, b",".join(email_ids), '(BODY.PEEK[])')
+                if status == 'OK':
+                    # Message parts come back as (b'<id> (BODY[] {size}', raw) tuples
+                    fetched = [part for part in msg_data if isinstance(part, tuple)]
+            
+            processed_ids = []
+            for envelope, raw_email in fetched:
+                email_id = envelope.split(None, 1)[0]
                 msg = email.message_from_bytes(raw_email)
                 
                 # Get email details
@@ -121,13 +388,9 @@ class BankReportsFetcher:
                 date_str = self._decode_header(msg["Date"])
                 
                 # Check if this is from a bank domain
-                sender_domain = from_address.split("@")[-1].lower() if "@" in from_address else ""
-                bank_name = None
-                
-                for bank in TRACKED_BANKS:
-                    if bank["domain"] in sender_domain:
-                        bank_name = bank["name"]
-                        break
+                sender_address = parseaddr(from_address)[1]
+                sender_domain = sender_address.rpartition("@")[2].lower() if "@" in sender_address else ""
+                bank_name = _bank_for_domain(sender_domain)
                 
                 if not bank_name:
                     continue
@@ -164,117 +427,134 @@ class BankReportsFetcher:
                         unique_filename = f"{bank_name.replace(' ', '_')}_{timestamp}.pdf".lower()
                         file_path = os.path.join(DATA_DIR, unique_filename)
                         
-                        # Save the file
-                        with open(file_path, 'wb') as f:
-                            f.write(payload)
-                            
                         # Process the report
-                        await self.process_report(file_path, bank_name, from_address, subject)
+                        await self._process_pdf_bytes(payload, file_path, bank_name, from_address, subject)
                         
-                # Mark the email as read
-                mail.store(email_id, '+FLAGS', '\\Seen')
+                processed_ids.append(email_id)
+                
+            # Mark the processed emails as read
+            if processed_ids:
+                await asyncio.to_thread(mail.store, b",".join(processed_ids), '+FLAGS', '\\Seen')
                 
             # Logout
-            mail.close()
-            mail.logout()
+            await asyncio.to_thread(mail.close)
+            await asyncio.to_thread(mail.logout)
             
         except Exception as e:
             logger.error(f"Error fetching reports via email: {str(e)}", 
                        extra={"metadata": {"error": str(e)}})
     
     async def fetch_reports_via_web(self):
-        """Fetch reports by scraping bank websites."""
-        for bank in TRACKED_BANKS:
-            if not bank["url"]:
-                continue
-                
-            try:
-                logger.info(f"Scraping reports from {bank['name']} website", 
-                           extra={"metadata": {"bank": bank["name"], "url": bank["url"]}})
-                
-                # Get the webpage
-                response = self.session.get(bank["url"], timeout=30)
-                response.raise_for_status()
-                
-                # Parse the HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Look for PDF links - this is a basic approach and may need customization per bank
-                pdf_links = []
-                
-                # Find all links
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    link_text = link.get_text().strip().lower()
-                    
-                    # Check if it's likely a quarterly report link
-                    is_report_link = (
-                        href.lower().endswith('.pdf') and 
-                        any(term in link_text for term in [
-                            'quarter', 'earnings', 'results', 'financial', 'report'
-                        ])
-                    )
-                    
-                    if is_report_link:
-                        # Make the URL absolute if it's relative
-                        if href.startswith('/'):
-                            base_url = '/'.join(bank["url"].split('/')[:3])  # Get domain
-                            href = base_url + href
-                        elif not href.startswith('http'):
-                            href = bank["url"] + '/' + href
-                            
-                        pdf_links.append({
-                            "url": href,
-                            "text": link_text
-                        })
-                
-                # Download and process the PDFs
-                for link in pdf_links:
-                    try:
-                        # Generate a filename
-                        pdf_filename = link["url"].split('/')[-1]
-                        if not pdf_filename.lower().endswith('.pdf'):
-                            pdf_filename += '.pdf'
-                            
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        unique_filename = f"{bank['name'].replace(' ', '_')}_{timestamp}_{pdf_filename}".lower()
-                        file_path = os.path.join(DATA_DIR, unique_filename)
-                        
-                        # Check if we already have this report
-                        if await self._report_exists(link["url"]):
-                            logger.info(f"Report already exists, skipping: {link['url']}", 
-                                       extra={"metadata": {"url": link["url"]}})
-                            continue
-                        
-                        # Download the PDF
-                        logger.info(f"Downloading PDF: {link['url']}", 
-                                   extra={"metadata": {"url": link["url"]}})
-                        pdf_response = self.session.get(link["url"], timeout=30)
-                        pdf_response.raise_for_status()
-                        
-                        # Save the file
-                        with open(file_path, 'wb') as f:
-                            f.write(pdf_response.content)
-                            
-                        # Process the report
-                        await self.process_report(file_path, bank["name"], bank["url"], link["text"])
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing PDF link: {str(e)}", 
-                                   extra={"metadata": {"link": link, "error": str(e)}})
+        """Fetch reports by scraping all bank websites concurrently."""
+        banks = [bank for bank in TRACKED_BANKS if bank["url"]]
+        bank_links = await asyncio.gather(*(self._scrape_bank(bank) for bank in banks))
+        
+        # Check which reports we already have with a single query
+        existing_urls = await self._existing_report_urls(
+            [link["url"] for links in bank_links for link in links]
+        )
+        
+        # Download and process the new PDFs concurrently
+        tasks = []
+        for bank, links in zip(banks, bank_links):
+            for link in links:
+                if link["url"] in existing_urls:
+                    logger.info(f"Report already exists, skipping: {link['url']}", 
+                               extra={"metadata": {"url": link["url"]}})
+                    continue
+                tasks.append(self._process_pdf_link(bank, link))
+        
+        await asyncio.gather(*tasks)
+    
+    async def _scrape_bank(self, bank):
+        """Scrape one bank's website and return its report PDF links."""
+        try:
+            logger.info(f"Scraping reports from {bank['name']} website", 
+                       extra={"metadata": {"bank": bank["name"], "url": bank["url"]}})
+            
+            return await self._get_pdf_links(bank)
+            
+        except Exception as e:
+            logger.error(f"Error scraping {bank['name']} website: {str(e)}", 
+                       extra={"metadata": {"bank": bank["name"], "error": str(e)}})
+            return []
+    
+    async def _get_pdf_links(self, bank):
+        """Return the report PDF links on a bank's page, reusing cached links if unchanged."""
+        cache_key = f"page:{bank['url']}"
+        cached = report_cache.get(cache_key) or {}
+        
+        # Get the webpage, unless it hasn't changed since the last run
+        html, validators = await self._fetch_if_modified(bank["url"], cached.get("validators", {}))
+        if html is None:
+            logger.info(f"{bank['name']} website unchanged, reusing cached links", 
+                       extra={"metadata": {"bank": bank["name"], "url": bank["url"]}})
+            return cached.get("links", [])
+        
+        # Parse the HTML
+        tree = LexborHTMLParser(html)
+        
+        # Look for PDF links - this is a basic approach and may need customization per bank
+        pdf_links = []
+        
+        # Find all PDF links, letting the CSS engine filter out everything else
+        for link in tree.css('a[href$=".pdf" i]'):
+            href = link.attributes["href"]
+            
+            # Check if it's likely a quarterly report link
+            link_text = link.text().strip().lower()
+            if any(term in link_text for term in REPORT_LINK_TERMS):
+                # Resolve relative links against the page URL
+                pdf_links.append({
+                    "url": urljoin(bank["url"], href),
+                    "text": link_text
+                })
+        
+        if validators.get("etag") or validators.get("last_modified"):
+            report_cache.set(cache_key, {"validators": validators, "links": pdf_links},
+                             expire=PAGE_CACHE_EXPIRY)
+        
+        return pdf_links
+    
+    async def _process_pdf_link(self, bank, link):
+        """Download a single report PDF and process it."""
+        try:
+            # Generate a filename
+            pdf_filename = link["url"].split('/')[-1]
+            if not pdf_filename.lower().endswith('.pdf'):
+                pdf_filename += '.pdf'
                 
-            except Exception as e:
-                logger.error(f"Error scraping {bank['name']} website: {str(e)}", 
-                           extra={"metadata": {"bank": bank["name"], "error": str(e)}})
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            unique_filename = f"{bank['name'].replace(' ', '_')}_{timestamp}_{pdf_filename}".lower()
+            file_path = os.path.join(DATA_DIR, unique_filename)
+            
+            # Download the PDF
+            logger.info(f"Downloading PDF: {link['url']}", 
+                       extra={"metadata": {"url": link["url"]}})
+            pdf_bytes = await self._fetch(link["url"])
+            
+            # Process the report
+            await self._process_pdf_bytes(pdf_bytes, file_path, bank["name"], bank["url"], link["text"],
+                                          source_url=link["url"])
+            
+        except Exception as e:
+            logger.error(f"Error processing PDF link: {str(e)}", 
+                       extra={"metadata": {"link": link, "error": str(e)}})
     
-    async def process_report(self, file_path, bank_name, source, title):
-        """Process a bank report PDF."""
+    async def process_report(self, pdf_bytes, file_path, bank_name, source, title, content_sha256=None,
+                             source_url=None):
+        """Process a bank report PDF and return its report ID once stored.
+        
+        The PDF is handled in memory; file_path only names the report and
+        its storage object. source_url is the address the PDF was downloaded
+        from, if it came from the web.
+        """
         try:
             logger.info(f"Processing report: {file_path}", 
                        extra={"metadata": {"file": file_path, "bank": bank_name}})
             
             # Extract text from PDF
-            text = await self._extract_text_from_pdf(file_path)
+            text = await self._extract_text_from_pdf(pdf_bytes, file_path)
             
             if not text or len(text) < 100:
                 logger.warning(f"Failed to extract meaningful text from PDF: {file_path}", 
@@ -287,14 +567,12 @@ class BankReportsFetcher:
             # Determine report type and fiscal period
             report_type, fiscal_period = self._determine_report_type(text, title)
             
-            # Extract metrics using AI
-            metrics = await self._extract_metrics(text, bank_name)
-            
-            # Summarize the report
-            summary = await self._summarize_report(text, bank_name)
-            
-            # Upload the file to Supabase storage
-            file_url = await self._upload_to_storage(file_path)
+            # Analyze the report with AI and upload the file to Supabase
+            # storage concurrently, since neither depends on the other
+            (metrics, summary), file_url = await asyncio.gather(
+                self._analyze_report(text, bank_name),
+                self._upload_to_storage(pdf_bytes, file_path)
+            )
             
             # Determine report date
             report_date = datetime.now().date().isoformat()
@@ -309,16 +587,19 @@ class BankReportsFetcher:
                 "metrics": metrics,
                 "summary": summary,
                 "file_url": file_url,
+                "source_url": source_url,
+                "content_sha256": content_sha256 or hashlib.sha256(pdf_bytes).hexdigest(),
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat()
             }
             
             # Store in Supabase
-            result = supabase.table(BANK_REPORTS_TABLE).upsert(report_data).execute()
+            result = await asyncio.to_thread(supabase.table(BANK_REPORTS_TABLE).upsert(report_data).execute)
             
             if result.data:
                 logger.info(f"Successfully stored bank report: {report_id}", 
                            extra={"metadata": {"report_id": report_id}})
+                return report_id
             else:
                 logger.warning(f"Failed to store bank report: {report_id}", 
                              extra={"metadata": {"report_id": report_id}})
@@ -327,38 +608,48 @@ class BankReportsFetcher:
             logger.error(f"Error processing report: {str(e)}", 
                        extra={"metadata": {"file": file_path, "error": str(e)}})
     
-    async def _extract_text_from_pdf(self, file_path):
-        """Extract text from a PDF file."""
+    async def _extract_text_from_pdf(self, pdf_bytes, file_path):
+        """Extract text from in-memory PDF bytes."""
         try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
-            return text
+            # Counting pages and extracting text both happen off the event
+            # loop, with the document opened only once
+            page_count, text = await asyncio.to_thread(_read_pdf_text_unless_large, pdf_bytes)
+            if text is not None:
+                return text
+            
+            logger.info(f"Extracting large PDF ({page_count} pages) in a worker process", 
+                       extra={"metadata": {"file": file_path, "pages": page_count}})
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_process_pool(), _read_pdf_text, pdf_bytes)
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}", 
                        extra={"metadata": {"file": file_path, "error": str(e)}})
             return ""
     
-    async def _extract_metrics(self, text, bank_name):
-        """Extract key financial metrics from the report text using AI."""
+    async def _analyze_report(self, text, bank_name):
+        """Extract key financial metrics and a summary from the report using AI.
+        
+        Both come from a single request and are returned as (metrics, summary).
+        """
         try:
             # Limit text length to avoid token limits
-            text_sample = text[:10000]  # Use first 10k chars
+            text_sample = text[:MAX_REPORT_CHARS]
             
             prompt = f"""
-            Extract key financial metrics from this bank ({bank_name}) earnings report.
-            Return ONLY a JSON object with these fields (if found):
-            - revenue: Total revenue in millions USD
-            - net_income: Net income in millions USD
-            - eps: Earnings per share (numeric)
-            - assets: Total assets in billions USD
-            - deposits: Total deposits in billions USD
-            - loans: Total loans in billions USD
-            - capital_ratio: Capital ratio as a percentage
-            - return_on_equity: ROE as a percentage
+            Analyze this bank ({bank_name}) earnings report.
+            Return ONLY a JSON object with these two keys:
+            - metrics: an object with these fields (null if not found):
+                - revenue: Total revenue in millions USD
+                - net_income: Net income in millions USD
+                - eps: Earnings per share (numeric)
+                - assets: Total assets in billions USD
+                - deposits: Total deposits in billions USD
+                - loans: Total loans in billions USD
+                - capital_ratio: Capital ratio as a percentage
+                - return_on_equity: ROE as a percentage
+            - summary: A summary of the report including key financial results,
+              business highlights, and outlook if available. Keep it under 500 words
+              and focus on the most important information for investors.
             
             Report text:
             {text_sample}
@@ -366,22 +657,23 @@ class BankReportsFetcher:
             Response in JSON format only:
             """
             
-            model = genai.GenerativeModel("gemini-1.5-pro")
-            response = model.generate_content(prompt)
+            response = await self._generate(prompt)
             
             # Parse the response
             try:
-                # Extract JSON if it's wrapped in markdown code blocks
-                response_text = response.text
-                if "```json" in response_text:
-                    response_text = response_text.split("```json")[1].split("```")[0].strip()
-                elif "```" in response_text:
-                    response_text = response_text.split("```")[1].split("```")[0].strip()
+                # Extract JSON if it's wrapped in markdown code blocks; bare
+                # JSON is left alone in case the summary itself contains a fence
+                response_text = response.text.strip()
+                fence_match = not response_text.startswith("{") and _FENCE_RE.search(response_text)
+                if fence_match:
+                    response_text = fence_match.group(2)
                 
-                metrics = json.loads(response_text)
-                return metrics
+                analysis = orjson.loads(response_text)
+                metrics = analysis.get("metrics") or {}
+                summary = (analysis.get("summary") or "").strip() or "Failed to generate summary."
+                return metrics, summary
             except:
-                logger.warning("Failed to parse metrics as JSON, using raw response", 
+                logger.warning("Failed to parse report analysis as JSON, using raw response", 
                              extra={"metadata": {"response": response.text[:500]}})
                 
                 # Return a structured but empty metrics object
@@ -395,56 +687,50 @@ class BankReportsFetcher:
                     "capital_ratio": None,
                     "return_on_equity": None,
                     "raw_response": response.text[:500]
-                }
+                }, "Failed to generate summary."
                 
         except Exception as e:
-            logger.error(f"Error extracting metrics: {str(e)}", 
+            logger.error(f"Error analyzing report: {str(e)}", 
                        extra={"metadata": {"error": str(e)}})
-            return {}
+            return {}, "Failed to generate summary."
     
-    async def _summarize_report(self, text, bank_name):
-        """Summarize the report using AI."""
-        try:
-            # Limit text length to avoid token limits
-            text_sample = text[:15000]  # Use first 15k chars
-            
-            prompt = f"""
-            Summarize this earnings report for {bank_name}. 
-            Include key financial results, business highlights, and outlook if available.
-            Keep the summary under 500 words and focus on the most important information for investors.
-            
-            Report text:
-            {text_sample}
-            """
-            
-            model = genai.GenerativeModel("gemini-1.5-pro")
-            response = model.generate_content(prompt)
-            
-            return response.text.strip()
-            
-        except Exception as e:
-            logger.error(f"Error summarizing report: {str(e)}", 
-                       extra={"metadata": {"error": str(e)}})
-            return "Failed to generate summary."
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_exponential(multiplier=2, min=2, max=60),
+        retry=retry_if_exception_type(ResourceExhausted),
+        reraise=True
+    )
+    async def _generate(self, prompt):
+        """Send a prompt to Gemini, backing off while rate limited."""
+        async with self._ai_semaphore():
+            return await self._gemini.generate_content_async(prompt)
+    
+    async def _upload_to_storage(self, pdf_bytes, file_path):
+        """Upload PDF bytes to Supabase storage and return the public URL."""
+        # The storage client is synchronous, so keep it off the event loop
+        return await asyncio.to_thread(self._upload_file, pdf_bytes, file_path)
     
-    async def _upload_to_storage(self, file_path):
-        """Upload a file to Supabase storage and return the public URL."""
+    def _upload_file(self, pdf_bytes, file_path):
+        """Blocking upload of PDF bytes to Supabase storage."""
         try:
             bucket_name = "reports"
             file_name = os.path.basename(file_path)
             
-            # Check if the bucket exists
-            storage_buckets = supabase.storage.list_buckets().execute()
-            bucket_exists = any(bucket["name"] == bucket_name for bucket in storage_buckets.data)
-            
-            if not bucket_exists:
-                supabase.storage.create_bucket(bucket_name).execute()
-                logger.info(f"Created storage bucket: {bucket_name}", 
-                           extra={"metadata": {"bucket": bucket_name}})
+            # Check if the bucket exists, once per fetcher
+            if bucket_name not in self._bucket_ready:
+                storage_buckets = supabase.storage.list_buckets().execute()
+                bucket_exists = any(bucket["name"] == bucket_name for bucket in storage_buckets.data)
+                
+                if not bucket_exists:
+                    supabase.storage.create_bucket(bucket_name).execute()
+                    logger.info(f"Created storage bucket: {bucket_name}", 
+                               extra={"metadata": {"bucket": bucket_name}})
+                self._bucket_ready.add(bucket_name)
             
             # Upload the file
-            with open(file_path, "rb") as f:
-                supabase.storage.from_(bucket_name).upload(file_name, f)
+            supabase.storage.from_(bucket_name).upload(
+                file_name, pdf_bytes, {"content-type": "application/pdf"}
+            )
                 
             # Get the public URL
             file_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
@@ -484,14 +770,7 @@ class BankReportsFetcher:
         if not subject:
             return False
             
-        subject = subject.lower()
-        
-        keywords = [
-            "earnings", "financial results", "quarterly results", "q1", "q2", "q3", "q4",
-            "financial report", "annual report", "quarterly report"
-        ]
-        
-        return any(keyword in subject for keyword in keywords)
+        return _EARNINGS_EMAIL_RE.search(subject.lower()) is not None
     
     def _determine_report_type(self, text, title):
         """Determine the report type and fiscal period from text and title."""
@@ -503,44 +782,50 @@ class BankReportsFetcher:
         fiscal_period = "unknown"
         
         # Check for quarterly report
-        if any(q in title_lower or q in text_lower for q in ["q1", "q2", "q3", "q4", "quarter", "quarterly"]):
+        if _QUARTERLY_RE.search(title_lower) or _QUARTERLY_RE.search(text_lower):
             report_type = "quarterly"
             
-            # Try to determine which quarter
-            for q in ["q1", "q2", "q3", "q4"]:
-                if q in title_lower or q in text_lower:
-                    quarter = q.upper()
-                    break
-            else:
-                quarter = "Q?"
+            # Try to determine which quarter, preferring the title
+            quarter_match = _QUARTER_RE.search(title_lower) or _QUARTER_RE.search(text_lower)
+            quarter = quarter_match.group(0).upper() if quarter_match else "Q?"
                 
             # Try to find year
-            import re
-            year_match = re.search(r'20[12]\d', title_lower + " " + text_lower[:200])
+            year_match = _YEAR_RE.search(title_lower + " " + text_lower[:200])
             year = year_match.group(0) if year_match else datetime.now().year
                 
             fiscal_period = f"{quarter} {year}"
             
         # Check for annual report
-        elif any(term in title_lower or term in text_lower for term in ["annual", "yearly", "full year"]):
+        elif _ANNUAL_RE.search(title_lower) or _ANNUAL_RE.search(text_lower):
             report_type = "annual"
             
             # Try to find year
-            import re
-            year_match = re.search(r'20[12]\d', title_lower + " " + text_lower[:200])
+            year_match = _YEAR_RE.search(title_lower + " " + text_lower[:200])
             year = year_match.group(0) if year_match else datetime.now().year
                 
             fiscal_period = f"FY {year}"
             
         return report_type, fiscal_period
     
-    async def _report_exists(self, url):
-        """Check if a report with the given URL already exists in the database."""
+    async def _existing_report_urls(self, urls):
+        """Return the subset of source PDF URLs that already have a report in the database."""
+        if not urls:
+            return set()
         try:
-            result = supabase.table(BANK_REPORTS_TABLE).select("id").eq("file_url", url).execute()
-            return len(result.data) > 0
+            query = supabase.table(BANK_REPORTS_TABLE).select("source_url").in_("source_url", urls)
+            result = await asyncio.to_thread(query.execute)
+            return {row["source_url"] for row in result.data}
         except Exception:
-            return False
+            return set()
+    
+    async def _report_id_for_digest(self, digest):
+        """Return the ID of a stored report with the given PDF SHA-256, if any."""
+        try:
+            query = supabase.table(BANK_REPORTS_TABLE).select("id").eq("content_sha256", digest).limit(1)
+            result = await asyncio.to_thread(query.execute)
+            return result.data[0]["id"] if result.data else None
+        except Exception:
+            return None
 
 async def main():
     """Main function to run the bank reports fetcher."""
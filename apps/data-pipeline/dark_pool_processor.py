@@ -1,38 +1,37 @@
 import asyncio
 import logging
-import json
-import os
 from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import numpy as np
+from json_logging import json_log_handler
+from supabase_batcher import get_upsert_batcher
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "component": "%(name)s", "message": "%(message)s", "metadata": %(metadata)s}')
-
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+logging.basicConfig(level=logging.INFO, handlers=[json_log_handler()])
 
 DARK_POOL_TABLE = "dark_pool_data"
 
+# Tickers processed at once, and the pause each one holds its slot for,
+# to stay within the data provider's rate limits
+MAX_CONCURRENT_TICKERS = 5
+REQUEST_DELAY = 0.2  # seconds
+
+# Analysis thresholds (example values)
+SIG_VOL_THRESHOLD = 100_000  # dark pool shares for significant volume
+PCT_THRESHOLD = 20  # dark pool share of total volume, in percent
+BLOCK_THRESHOLD = 25_000  # shares for a single trade to count as a block
+
 class DarkPoolProcessor:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        })
         # Note: In a production environment, you would use an actual API or data provider
         # for dark pool data. This is a simplified example.
         self.dark_pool_url = "https://example.com/dark-pool-data"  # Placeholder URL
     
-    async def fetch_dark_pool_data(self, ticker):
+    async def fetch_dark_pool_data(self, ticker, now=None):
         """
         Fetch dark pool data for a specific ticker.
         
+        now is the batch's shared timestamp; the current time is used if omitted.
+        
         Note: This is a placeholder implementation. In a real-world scenario,
         you would subscribe to a financial data provider that offers dark pool data.
         """
@@ -41,7 +40,7 @@ class DarkPoolProcessor:
             # In reality, you would make API calls to a data provider
             
             # Sample data structure
-            current_date = datetime.now()
+            current_date = now or datetime.now()
             data = {
                 "ticker": ticker,
                 "date": current_date.strftime("%Y-%m-%d"),
@@ -69,9 +68,12 @@ class DarkPoolProcessor:
                         extra={"metadata": {"ticker": ticker}})
             return None
     
-    def analyze_dark_pool_data(self, data):
+    def analyze_dark_pool_data(self, data, now_iso=None):
         """
         Analyze dark pool data to identify patterns or significant activity.
+        
+        now_iso is the batch's shared analysis timestamp; the current time is
+        used if omitted.
         """
         if not data:
             return None
@@ -83,11 +85,14 @@ class DarkPoolProcessor:
             total_volume = data["total_volume"]
             
             # Calculate metrics
-            significant_volume = dark_pool_volume > 100000  # Example threshold
-            high_percentage = dark_pool_percentage > 20  # Example threshold
+            significant_volume = dark_pool_volume > SIG_VOL_THRESHOLD
+            high_percentage = dark_pool_percentage > PCT_THRESHOLD
             
-            # Check for block trades (large individual trades)
-            large_blocks = [block for block in data["blocks"] if block["volume"] > 25000]  # Example threshold
+            # Check for block trades (large individual trades), scanning the
+            # block volumes as one array rather than per-block Python objects
+            blocks = data["blocks"]
+            volumes = np.fromiter((block["volume"] for block in blocks), dtype=np.int64, count=len(blocks))
+            large_block_count = int(np.count_nonzero(volumes > BLOCK_THRESHOLD))
             
             analysis = {
                 "ticker": ticker,
@@ -97,9 +102,9 @@ class DarkPoolProcessor:
                 "total_volume": total_volume,
                 "significant_volume": significant_volume,
                 "high_percentage": high_percentage,
-                "large_block_count": len(large_blocks),
-                "largest_block": max([block["volume"] for block in data["blocks"]]) if data["blocks"] else 0,
-                "analysis_timestamp": datetime.now().isoformat()
+                "large_block_count": large_block_count,
+                "largest_block": int(volumes.max()) if volumes.size else 0,
+                "analysis_timestamp": now_iso or datetime.now().isoformat()
             }
             
             return analysis
@@ -108,74 +113,76 @@ class DarkPoolProcessor:
                         extra={"metadata": {"ticker": data.get("ticker", "unknown")}})
             return None
     
-    def store_dark_pool_data(self, analysis):
+    async def store_dark_pool_data(self, analyses):
         """
-        Store dark pool analysis in Supabase database.
+        Store a run's dark pool analyses in Supabase database.
+        
+        The analyses are submitted to the shared batcher together, so they go
+        out as one upsert (per max_batch_size rows), coalesced with any
+        other processor writing on the same event loop.
         """
-        if not analysis:
+        if not analyses:
             return
         
-        try:
-            # Check if entry for this ticker and date already exists
-            existing = supabase.table(DARK_POOL_TABLE) \
-                .select("id") \
-                .eq("ticker", analysis["ticker"]) \
-                .eq("date", analysis["date"]) \
-                .execute()
-            
-            if not existing.data or len(existing.data) == 0:
-                # Insert new analysis
-                supabase.table(DARK_POOL_TABLE).insert(analysis).execute()
-                logger.info(f"Inserted new dark pool analysis for {analysis['ticker']}", 
-                          extra={"metadata": {"ticker": analysis["ticker"]}})
-            else:
-                # Update existing analysis
-                supabase.table(DARK_POOL_TABLE) \
-                    .update(analysis) \
-                    .eq("ticker", analysis["ticker"]) \
-                    .eq("date", analysis["date"]) \
-                    .execute()
-                logger.info(f"Updated dark pool analysis for {analysis['ticker']}", 
-                          extra={"metadata": {"ticker": analysis["ticker"]}})
-        except Exception as e:
-            logger.error(f"Error storing dark pool analysis: {e}", 
-                        extra={"metadata": {"ticker": analysis.get("ticker", "unknown")}})
+        batcher = get_upsert_batcher()
+        results = await asyncio.gather(
+            *(batcher.process((DARK_POOL_TABLE, "ticker,date", analysis)) for analysis in analyses),
+            return_exceptions=True
+        )
+        for analysis, result in zip(analyses, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error storing dark pool analysis: {result}", 
+                            extra={"metadata": {"ticker": analysis.get("ticker", "unknown")}})
+        
+        logger.info(f"Stored {len(analyses)} dark pool analyses", 
+                   extra={"metadata": {"count": len(analyses)}})
     
     async def run(self, tickers):
         """
-        Process dark pool data for a list of tickers.
+        Process dark pool data for a list of tickers concurrently.
         """
-        for ticker in tickers:
-            logger.info(f"Processing dark pool data for {ticker}", 
-                       extra={"metadata": {"ticker": ticker}})
-            
-            data = await self.fetch_dark_pool_data(ticker)
-            if data:
-                analysis = self.analyze_dark_pool_data(data)
-                if analysis:
-                    self.store_dark_pool_data(analysis)
+        sem = asyncio.Semaphore(MAX_CONCURRENT_TICKERS)
+        
+        # One timestamp for the whole batch rather than one per ticker
+        batch_now = datetime.now()
+        batch_iso = batch_now.isoformat()
+        
+        async def process_ticker(ticker):
+            async with sem:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Processing dark pool data for {ticker}", 
+                               extra={"metadata": {"ticker": ticker}})
+                
+                data = await self.fetch_dark_pool_data(ticker, now=batch_now)
+                analysis = self.analyze_dark_pool_data(data, now_iso=batch_iso) if data else None
+                
+                # Avoid rate limiting
+                await asyncio.sleep(REQUEST_DELAY)
             
-            # Avoid rate limiting
-            await asyncio.sleep(1)
+            return analysis
+        
+        results = await asyncio.gather(*(process_ticker(ticker) for ticker in tickers), return_exceptions=True)
+        analyses = []
+        for ticker, result in zip(tickers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error processing dark pool data for {ticker}: {result}", 
+                            extra={"metadata": {"ticker": ticker}})
+            elif result:
+                analyses.append(result)
+        
+        # Write the whole run at once, once every ticker is analyzed
+        await self.store_dark_pool_data(analyses)
         
         logger.info(f"Completed dark pool processing for {len(tickers)} tickers", 
                    extra={"metadata": {"count": len(tickers)}})
-    
-    def close(self):
-        """Close the session."""
-        if self.session:
-            self.session.close()
 
 async def main():
     processor = DarkPoolProcessor()
-    try:
-        # Example list of tickers to process
-        # In practice, you might get this from database or configuration
-        tickers = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
-        await processor.run(tickers)
-    finally:
-        processor.close()
+    
+    # Example list of tickers to process
+    # In practice, you might get this from database or configuration
+    tickers = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+    await processor.run(tickers)
 
 if __name__ == "__main__":
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(main()) 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
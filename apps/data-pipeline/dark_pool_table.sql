@@ -0,0 +1,62 @@
+-- Create dark_pool_data table for storing dark pool analysis
+CREATE TABLE IF NOT EXISTS dark_pool_data (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    dark_pool_percentage DECIMAL,
+    dark_pool_volume BIGINT,
+    total_volume BIGINT,
+    significant_volume BOOLEAN,
+    high_percentage BOOLEAN,
+    large_block_count INTEGER,
+    largest_block BIGINT,
+    analysis_timestamp TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    
+    -- Enforce unique constraint on ticker and date
+    CONSTRAINT dark_pool_unique_ticker_date UNIQUE (ticker, date)
+);
+
+-- Bring tables created from another definition (such as the trade-level one
+-- in migration_unusual_whales.sql) up to the columns the processor writes
+ALTER TABLE dark_pool_data
+    ADD COLUMN IF NOT EXISTS date TEXT,
+    ADD COLUMN IF NOT EXISTS dark_pool_percentage DECIMAL,
+    ADD COLUMN IF NOT EXISTS dark_pool_volume BIGINT,
+    ADD COLUMN IF NOT EXISTS total_volume BIGINT,
+    ADD COLUMN IF NOT EXISTS significant_volume BOOLEAN,
+    ADD COLUMN IF NOT EXISTS high_percentage BOOLEAN,
+    ADD COLUMN IF NOT EXISTS large_block_count INTEGER,
+    ADD COLUMN IF NOT EXISTS largest_block BIGINT,
+    ADD COLUMN IF NOT EXISTS analysis_timestamp TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ DEFAULT now();
+
+-- Analysis rows carry no id or trade-level fields, so on the trade-level table
+-- generate the text id and let those fields be empty
+DO $$
+DECLARE
+    legacy_column TEXT;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = 'dark_pool_data'
+          AND column_name = 'id' AND data_type = 'text'
+    ) THEN
+        ALTER TABLE dark_pool_data ALTER COLUMN id SET DEFAULT gen_random_uuid()::text;
+    END IF;
+
+    FOREACH legacy_column IN ARRAY ARRAY['volume', 'price', 'timestamp', 'blocks_count', 'percent_of_volume'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'dark_pool_data'
+              AND column_name = legacy_column
+        ) THEN
+            EXECUTE format('ALTER TABLE dark_pool_data ALTER COLUMN %I DROP NOT NULL', legacy_column);
+        END IF;
+    END LOOP;
+END
+$$;
+
+-- Unique key used by the processor's upsert (ON CONFLICT (ticker, date)) on
+-- tables created before the constraint above
+CREATE UNIQUE INDEX IF NOT EXISTS dark_pool_ticker_date_key ON dark_pool_data (ticker, date);
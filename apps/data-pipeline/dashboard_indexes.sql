@@ -0,0 +1,51 @@
+-- Indexes backing the filters and sort orders used by dashboard_server.py.
+-- Each list endpoint sorts newest-first and takes a LIMIT, so these let the
+-- planner walk an index and stop early instead of sorting the whole table.
+-- CONCURRENTLY avoids locking writers but can't run inside a transaction
+-- block, so run these statements one at a time.
+
+-- recent_dark_pool: optional ticker filter, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_darkpool_ticker_date ON dark_pool_data (ticker, date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_darkpool_date ON dark_pool_data (date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_darkpool_high_percentage_date ON dark_pool_data (high_percentage, date DESC);
+
+-- recent_option_flow: optional ticker filter, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_optionflow_ticker_date ON option_flow_data (ticker, date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_optionflow_date ON option_flow_data (date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_optionflow_unusual_date ON option_flow_data (has_unusual_activity, date DESC);
+
+-- recent_alerts: optional investor filter, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_investor_created ON holdings_alerts (investor_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_created ON holdings_alerts (created_at DESC);
+
+-- recent_alerts ticker filter: changes @> '[{"ticker": ...}]'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS holdings_alerts_changes_gin_idx ON holdings_alerts USING gin (changes jsonb_path_ops);
+
+-- recent_filings: optional form type filter, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_filings_form_type_date ON sec_filings (form_type, filing_date DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_filings_date ON sec_filings (filing_date DESC);
+
+-- investor_holdings: one investor's holdings, newest filing first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_holdings_investor_date ON investor_holdings (investor_id, filing_date DESC);
+
+-- recent_tweets and the dashboard summaries: newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_twitter_created ON twitter_data (created_at DESC);
+
+-- Distinct-value views for the report source/category and speaker filters
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_source ON economic_reports (source);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_category ON economic_reports (category);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_interviews_speaker ON interviews (speaker);
+
+-- Latest-row lookups: filter by key (if any), newest first, LIMIT 1. With the
+-- sort column in the index these are a single index probe instead of a sort
+-- of every matching row; investor_holdings is covered above.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fundamentals_ticker_ts ON fundamental_data (ticker, timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_market_ticker ON market_data (ticker);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_top_stocks_ts ON top_stocks (timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_econ_indicators_ts ON economic_indicators (timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_econ_news_ts ON economic_news (timestamp DESC);
+
+-- recent_economic_reports, recent_interviews and the earnings calendar range
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_ts ON economic_reports (timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_interviews_ts ON interviews (timestamp DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_earnings_report_date ON earnings_calendar (report_date);
@@ -0,0 +1,80 @@
+-- Views and RPC functions used by dashboard_server.py for queries that
+-- PostgREST's query syntax can't express
+
+-- recent_alerts with a ticker: alerts whose changes include the ticker, with
+-- each alert's changes narrowed down to that ticker. The containment filter
+-- is served by holdings_alerts_changes_gin_idx (see dashboard_indexes.sql).
+CREATE OR REPLACE FUNCTION get_recent_alerts_for_ticker(
+    p_ticker text,
+    p_limit integer DEFAULT 10,
+    p_investor_id text DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+SELECT COALESCE(jsonb_agg(a.alert ORDER BY a.created_at DESC), '[]'::jsonb)
+FROM (
+    SELECT
+        h.created_at,
+        to_jsonb(h) || jsonb_build_object(
+            'changes',
+            jsonb_path_query_array(h.changes, '$[*] ? (@.ticker == $t)', jsonb_build_object('t', p_ticker))
+        ) AS alert
+    FROM holdings_alerts h
+    WHERE h.changes @> jsonb_build_array(jsonb_build_object('ticker', p_ticker))
+      AND (p_investor_id IS NULL OR h.investor_id::text = p_investor_id)
+    ORDER BY h.created_at DESC
+    LIMIT p_limit
+) a;
+$$;
+
+-- Distinct values for the filter dropdowns, so the API transfers one row per
+-- value instead of every report or interview (indexes in dashboard_indexes.sql)
+CREATE OR REPLACE VIEW economic_report_sources_v AS
+SELECT DISTINCT source FROM economic_reports WHERE source IS NOT NULL;
+
+CREATE OR REPLACE VIEW economic_report_categories_v AS
+SELECT DISTINCT category FROM economic_reports WHERE category IS NOT NULL;
+
+CREATE OR REPLACE VIEW interview_speakers_v AS
+SELECT DISTINCT speaker FROM interviews WHERE speaker IS NOT NULL;
+
+-- economic_news: the latest news collection, with its items filtered by
+-- sentiment (if given) and cut to p_limit before they leave the database.
+-- NULL when there is no news yet.
+CREATE OR REPLACE FUNCTION get_latest_economic_news(
+    p_sentiment text DEFAULT NULL,
+    p_limit integer DEFAULT 20
+)
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+SELECT json_build_object(
+    'timestamp', latest.timestamp,
+    'news', COALESCE((
+        SELECT json_agg(item.value ORDER BY item.ordinality)
+        FROM (
+            SELECT value, ordinality
+            FROM json_array_elements(latest.news::json) WITH ORDINALITY
+            WHERE p_sentiment IS NULL OR value->>'sentiment_label' = p_sentiment
+            ORDER BY ordinality
+            LIMIT p_limit
+        ) item
+    ), '[]'::json)
+)
+FROM (SELECT timestamp, news FROM economic_news ORDER BY timestamp DESC LIMIT 1) latest;
+$$;
+
+-- Latest economic indicators and news collection side by side, so the
+-- dashboards fetch both in one request
+CREATE OR REPLACE VIEW dashboard_econ AS
+SELECT
+    (SELECT indicators FROM economic_indicators ORDER BY timestamp DESC LIMIT 1) AS indicators,
+    latest_news.news,
+    latest_news.timestamp AS news_timestamp
+FROM (SELECT 1) one
+LEFT JOIN LATERAL (
+    SELECT news, timestamp FROM economic_news ORDER BY timestamp DESC LIMIT 1
+) latest_news ON true;
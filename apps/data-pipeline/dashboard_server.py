@@ -1,21 +1,194 @@
 import os
+
+# Under gunicorn's gevent worker, patch blocking I/O before anything opens a
+# socket so concurrent Supabase calls yield to each other
+if os.getenv("GEVENT", "false").lower() in ("1", "true"):
+    from gevent import monkey
+    monkey.patch_all()
+
+import re
+import hashlib
+import hmac
 import json
 import logging
-from datetime import datetime, timedelta
-from flask import Flask, jsonify, request
+import httpx
+import orjson
+import redis
+from functools import lru_cache, wraps
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TLRUCache
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlencode
+from flask import Flask, g, request, stream_with_context
+from flask_compress import Compress
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from json_logging import json_log_handler
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='{"timestamp": "%(asctime)s", "level": "%(levelname)s", "component": "%(name)s", "message": "%(message)s", "metadata": %(metadata)s}')
+logging.basicConfig(level=logging.INFO, handlers=[json_log_handler()])
 
 load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Every endpoint here only reads, so all queries go to a read replica when
+# one is configured, leaving the primary to the pipeline's writes
+SUPABASE_URL_RO = os.getenv("SUPABASE_URL_RO") or SUPABASE_URL
+SUPABASE_KEY_RO = os.getenv("SUPABASE_KEY_RO") or SUPABASE_KEY
+supabase_ro: Client = create_client(SUPABASE_URL_RO, SUPABASE_KEY_RO)
+
+# Swap PostgREST's default HTTP/1.1 session for a pooled HTTP/2 one so every
+# endpoint reuses warm connections instead of paying the TLS handshake again.
+_default_session = supabase_ro.postgrest.session
+supabase_ro.postgrest.session = httpx.Client(
+    base_url=_default_session.base_url,
+    headers=_default_session.headers,
+    # Idle connections stay open for 30s between requests; connection
+    # failures (not HTTP errors) are retried twice before surfacing
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30)
+    ),
+    timeout=10.0
+)
+_default_session.close()
+_postgrest = supabase_ro.postgrest.session
 
 app = Flask(__name__)
 
+# Compress JSON bodies (repeated field names shrink several-fold), preferring
+# Brotli. Registered before the app's own after_request hook so it runs after
+# it and the ETag is taken from the uncompressed body. Streamed responses are
+# left uncompressed, since compressing them would buffer the whole body first.
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_LEVEL"] = 4
+app.config["COMPRESS_BR_LEVEL"] = 4
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_STREAMS"] = False
+Compress(app)
+
+# Datetimes are serialized natively (naive ones as UTC) and NumPy values as-is
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+def ojsonify(payload, status=200):
+    """Serialize a payload with orjson into a JSON response."""
+    return app.response_class(
+        orjson.dumps(payload, option=ORJSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+def stream_rows(rows, **extra):
+    """Yield a {"data": [...]} payload one orjson-encoded row at a time."""
+    yield b'{"data":['
+    first = True
+    for row in rows:
+        chunk = orjson.dumps(row, option=ORJSON_OPTIONS)
+        yield chunk if first else b',' + chunk
+        first = False
+    yield b']'
+    for key, value in extra.items():
+        yield b',' + orjson.dumps(key) + b':' + orjson.dumps(value)
+    yield b'}'
+
+def ostream(rows, **extra):
+    """Stream a list of rows as a JSON response without building the whole body."""
+    return app.response_class(
+        stream_with_context(stream_rows(rows, **extra)),
+        mimetype='application/json'
+    )
+
+# Cache of successful GET responses keyed on path and query args. The data
+# behind them changes on the pipeline's cadence, so each endpoint sets a TTL
+# to match: seconds for market data, hours for near-static lists. Shared
+# through Redis when REDIS_URL is set, otherwise kept per process.
+RESPONSE_CACHE_TTL = 30  # seconds
+SLOW_CACHE_TTL = 300  # seconds
+STATIC_CACHE_TTL = 3600  # seconds
+RESPONSE_CACHE_PREFIX = "dashboard:"
+REDIS_URL = os.getenv("REDIS_URL")
+_redis = redis.Redis(connection_pool=redis.ConnectionPool.from_url(REDIS_URL)) if REDIS_URL else None
+# Local entries are (body, ttl) pairs, each expiring after its own TTL
+_response_cache = TLRUCache(maxsize=1024, ttu=lambda key, value, now: now + value[1])
+_response_cache_lock = Lock()
+# Required by /api/cache/invalidate, which is disabled when it isn't set
+ADMIN_TOKEN = os.getenv("DASHBOARD_ADMIN_TOKEN")
+
+def _cache_get(key):
+    """Return a cached response body, or None on a miss."""
+    if _redis is not None:
+        try:
+            return _redis.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+    with _response_cache_lock:
+        entry = _response_cache.get(key)
+    return entry[0] if entry else None
+
+def _cache_set(key, body, ttl):
+    """Cache a response body for ttl seconds."""
+    if _redis is not None:
+        try:
+            _redis.setex(key, ttl, body)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache write failed: {e}")
+        return
+    with _response_cache_lock:
+        _response_cache[key] = (body, ttl)
+
+def _cache_clear():
+    """Drop every cached response."""
+    if _redis is not None:
+        try:
+            keys = list(_redis.scan_iter(match=f"{RESPONSE_CACHE_PREFIX}*", count=500))
+            if keys:
+                _redis.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache clear failed: {e}")
+    with _response_cache_lock:
+        _response_cache.clear()
+
+def cached_response(view=None, *, ttl=RESPONSE_CACHE_TTL):
+    """Serve repeated identical requests from the response cache for ttl seconds."""
+    if view is None:
+        return lambda view: cached_response(view, ttl=ttl)
+    
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.cache_ttl = ttl
+        key = f"{RESPONSE_CACHE_PREFIX}{request.path}?{urlencode(sorted(request.args.items(multi=True)))}"
+        body = _cache_get(key)
+        if body is not None:
+            return app.response_class(body, mimetype='application/json')
+        
+        response = view(*args, **kwargs)
+        if response.status_code == 200:
+            if response.is_streamed:
+                response.response = _cache_when_sent(key, response.response, ttl)
+            else:
+                _cache_set(key, response.get_data(), ttl)
+        return response
+    return wrapper
+
+def _cache_when_sent(key, chunks, ttl):
+    """Pass a streamed body through, caching it once it has been sent in full."""
+    sent = []
+    for chunk in chunks:
+        sent.append(chunk)
+        yield chunk
+    _cache_set(key, b"".join(sent), ttl)
+
+# Worker threads for running independent Supabase queries concurrently
+_query_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase-query")
+
+def _execute_all(queries):
+    """Execute independent Supabase queries concurrently and return each one's rows."""
+    futures = [_query_pool.submit(query.execute) for query in queries]
+    return [future.result().data or [] for future in futures]
+
 # Tables
 SEC_FILINGS_TABLE = "sec_filings"
 TWITTER_TABLE = "twitter_data"
@@ -33,169 +206,260 @@ EARNINGS_CALENDAR_TABLE = "earnings_calendar"
 ECONOMIC_REPORTS_TABLE = "economic_reports"
 INTERVIEWS_TABLE = "interviews"
 
+# Distinct-value views (see dashboard_queries.sql)
+ECONOMIC_REPORT_SOURCES_VIEW = "economic_report_sources_v"
+ECONOMIC_REPORT_CATEGORIES_VIEW = "economic_report_categories_v"
+INTERVIEW_SPEAKERS_VIEW = "interview_speakers_v"
+
+# Latest economic indicators and news in one row (see dashboard_queries.sql)
+DASHBOARD_ECON_VIEW = "dashboard_econ"
+
+# Pagination and column projection for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# All columns unless the client asks for fewer with ?fields=
+MARKET_SUMMARY_FIELDS = "*"
+_FIELDS_RE = re.compile(r"^(\*|[A-Za-z_][A-Za-z0-9_]*(,[A-Za-z_][A-Za-z0-9_]*)*)$")
+
+def _page_args():
+    """Return the (limit, offset) requested for a paginated list endpoint."""
+    limit = request.args.get('limit', default=DEFAULT_PAGE_SIZE, type=int)
+    offset = request.args.get('offset', default=0, type=int)
+    return min(max(limit, 1), MAX_PAGE_SIZE), max(offset, 0)
+
+def _fields_arg(default):
+    """Return the requested column list, or None if it isn't plain column names."""
+    fields = request.args.get('fields', default=default).replace(" ", "")
+    return fields if _FIELDS_RE.match(fields) else None
+
+@lru_cache(maxsize=32)
+def _iso_date_bounds(day, days):
+    """Return the ISO dates of a day (as an ordinal) and the day days after it."""
+    start = date.fromordinal(day)
+    return start.isoformat(), (start + timedelta(days=days)).isoformat()
+
+def date_bounds(days):
+    """Return (today, today + days) as ISO date strings, formatted once per day."""
+    return _iso_date_bounds(date.today().toordinal(), days)
+
+# Fixed parts of the recent-list queries, built once at import; each request
+# only adds its limit and filters (in PostgREST query syntax)
+RECENT_FILINGS_QUERY = {"select": "*", "order": "filing_date.desc"}
+RECENT_TWEETS_QUERY = {"select": "*", "order": "created_at.desc"}
+RECENT_DARK_POOL_QUERY = {"select": "*", "order": "date.desc"}
+RECENT_OPTION_FLOW_QUERY = {"select": "*", "order": "date.desc"}
+RECENT_ALERTS_QUERY = {"select": "*", "order": "created_at.desc"}
+RECENT_REPORTS_QUERY = {"select": "*", "order": "timestamp.desc"}
+RECENT_INTERVIEWS_QUERY = {"select": "*", "order": "timestamp.desc"}
+
+def _eq(value):
+    """Return a PostgREST equality filter for value, or None if it's empty."""
+    return f"eq.{value}" if value else None
+
+def _recent_rows(table, base_query, limit, **filters):
+    """Fetch a recent-list page straight from PostgREST, skipping empty filters."""
+    params = {**base_query, "limit": limit}
+    params.update((column, condition) for column, condition in filters.items() if condition)
+    response = _postgrest.get(f"/{table}", params=params)
+    response.raise_for_status()
+    return response.json()
+
+def _next_offset(rows, limit, offset):
+    """Return the offset of the next page, if there may be one."""
+    return offset + limit if len(rows) == limit else None
+
+# Query functions from dashboard_queries.sql
+RECENT_ALERTS_FOR_TICKER_FUNCTION = "get_recent_alerts_for_ticker"
+LATEST_ECONOMIC_NEWS_FUNCTION = "get_latest_economic_news"
+
+# Precomputed dashboard summary (see dashboard_summary.sql), refreshed by the
+# scheduler; older rows are ignored in favour of calling the function directly
+DASHBOARD_SUMMARY_VIEW = "dashboard_summary_mv"
+DASHBOARD_SUMMARY_FUNCTION = "get_dashboard_summary"
+TRADER_DASHBOARD_FUNCTION = "get_trader_dashboard"
+INVESTOR_DASHBOARD_FUNCTION = "get_investor_dashboard"
+DASHBOARD_SUMMARY_MAX_AGE = timedelta(minutes=15)
+
 # Cross-Origin Resource Sharing (CORS) settings
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE'
+}
+
+@app.before_request
+def preflight():
+    """Answer CORS preflight requests before any view runs."""
+    if request.method == 'OPTIONS':
+        return app.response_class(status=204)
+
 @app.after_request
 def after_request(response):
-    response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-    response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE')
+    response.headers.update(CORS_HEADERS)
+    # Let browsers and any CDN in front reuse successful GETs (including empty
+    # lists) for as long as the server-side response cache would
+    if request.method == 'GET' and request.path.startswith('/api/') and request.path != '/api/health' \
+            and response.status_code == 200:
+        response.headers['Cache-Control'] = f'public, max-age={g.get("cache_ttl", RESPONSE_CACHE_TTL)}'
+        # Revalidations of an unchanged body get an empty 304. Streamed bodies
+        # aren't hashed; their next request is a cache hit with a full body.
+        if not response.is_streamed:
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest(), weak=True)
+            response.make_conditional(request)
     return response
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return ojsonify({"status": "healthy", "timestamp": datetime.now(timezone.utc)})
+
+@app.route('/api/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """Clear the response cache, e.g. after a pipeline run writes new data."""
+    if not ADMIN_TOKEN:
+        return ojsonify({"error": "Not found"}, 404)
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {ADMIN_TOKEN}"):
+        return ojsonify({"error": "Unauthorized"}, 401)
+    
+    _cache_clear()
+    return ojsonify({"status": "cleared", "timestamp": datetime.now(timezone.utc)})
 
 @app.route('/api/market/summary', methods=['GET'])
+@cached_response
 def market_summary():
     """Get summary of market data for tracked tickers."""
     try:
-        response = supabase.table(MARKET_TABLE).select("*").execute()
-        
-        if not response.data:
-            return jsonify({"error": "No market data available"}), 404
+        limit, offset = _page_args()
+        fields = _fields_arg(MARKET_SUMMARY_FIELDS)
+        if fields is None:
+            return ojsonify({"error": "Invalid fields parameter"}, 400)
+        
+        response = supabase_ro.table(MARKET_TABLE) \
+            .select(fields) \
+            .order("ticker") \
+            .range(offset, offset + limit - 1) \
+            .execute()
         
-        return jsonify({"data": response.data})
+        return ostream(response.data or [])
     except Exception as e:
-        logger.error(f"Error fetching market summary: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching market summary: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/market/ticker/<ticker>', methods=['GET'])
+@cached_response
 def ticker_data(ticker):
     """Get market data for a specific ticker."""
     try:
-        response = supabase.table(MARKET_TABLE).select("*").eq("ticker", ticker).execute()
+        response = supabase_ro.table(MARKET_TABLE).select("*").eq("ticker", ticker).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": f"No data available for {ticker}"}), 404
+            return ojsonify({"error": f"No data available for {ticker}"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching {ticker} data: {e}", extra={"metadata": {"ticker": ticker}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching {ticker} data: {e}", extra={"ticker": ticker})
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/market/top-stocks', methods=['GET'])
+@cached_response(ttl=SLOW_CACHE_TTL)
 def top_stocks():
     """Get top gainers, losers, and most active stocks."""
     try:
-        response = supabase.table(TOP_STOCKS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
+        response = supabase_ro.table(TOP_STOCKS_TABLE).select("*").order("timestamp", desc=True).limit(1).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": "No top stocks data available"}), 404
+            return ojsonify({"error": "No top stocks data available"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching top stocks: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching top stocks: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/market/earnings', methods=['GET'])
+@cached_response(ttl=STATIC_CACHE_TTL)
 def earnings_calendar():
     """Get earnings calendar data."""
     try:
         days_ahead = request.args.get('days_ahead', default=7, type=int)
         
-        # Get current date
-        today = datetime.now().date()
-        future_date = today + timedelta(days=days_ahead)
+        today, future_date = date_bounds(days_ahead)
         
-        response = supabase.table(EARNINGS_CALENDAR_TABLE) \
+        response = supabase_ro.table(EARNINGS_CALENDAR_TABLE) \
             .select("*") \
-            .gte("report_date", today.isoformat()) \
-            .lte("report_date", future_date.isoformat()) \
-            .order("report_date", {"ascending": True}) \
+            .gte("report_date", today) \
+            .lte("report_date", future_date) \
+            .order("report_date") \
             .execute()
         
-        if not response.data:
-            return jsonify({"error": "No earnings calendar data available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ojsonify({"data": response.data or []})
     except Exception as e:
-        logger.error(f"Error fetching earnings calendar: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching earnings calendar: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/market/technical-indicators/<ticker>', methods=['GET'])
+@cached_response
 def technical_indicators(ticker):
     """Get technical indicators for a specific ticker."""
     try:
-        response = supabase.table(MARKET_TABLE).select("ticker,price,volume,rsi,macd,macd_signal,macd_histogram").eq("ticker", ticker).execute()
+        response = supabase_ro.table(MARKET_TABLE).select("ticker,price,volume,rsi,macd,macd_signal,macd_histogram").eq("ticker", ticker).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": f"No technical indicators available for {ticker}"}), 404
+            return ojsonify({"error": f"No technical indicators available for {ticker}"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching technical indicators for {ticker}: {e}", extra={"metadata": {"ticker": ticker}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching technical indicators for {ticker}: {e}", extra={"ticker": ticker})
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/filings/recent', methods=['GET'])
+@cached_response
 def recent_filings():
     """Get recent SEC filings."""
     try:
         limit = request.args.get('limit', default=10, type=int)
         form_type = request.args.get('form_type')
         
-        query = supabase.table(SEC_FILINGS_TABLE).select("*").order("filing_date", {"ascending": False}).limit(limit)
-        
-        if form_type:
-            query = query.eq("form_type", form_type)
-        
-        response = query.execute()
+        rows = _recent_rows(SEC_FILINGS_TABLE, RECENT_FILINGS_QUERY, limit, form_type=_eq(form_type))
         
-        if not response.data:
-            return jsonify({"error": "No filings available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ostream(rows)
     except Exception as e:
-        logger.error(f"Error fetching recent filings: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching recent filings: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/twitter/recent', methods=['GET'])
+@cached_response
 def recent_tweets():
     """Get recent Twitter data with stock mentions."""
     try:
         limit = request.args.get('limit', default=10, type=int)
         ticker = request.args.get('ticker')
         
-        query = supabase.table(TWITTER_TABLE).select("*").order("created_at", {"ascending": False}).limit(limit)
-        
-        if ticker:
-            # This is a simplified approach - in practice you would need a more complex query
-            # to filter by tickers in the JSON array
-            query = query.contains("tickers", [ticker])
+        # Tweets whose tickers array contains the ticker
+        rows = _recent_rows(TWITTER_TABLE, RECENT_TWEETS_QUERY, limit,
+                            tickers=f"cs.{{{ticker}}}" if ticker else None)
         
-        response = query.execute()
-        
-        if not response.data:
-            return jsonify({"error": "No Twitter data available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching recent tweets: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching recent tweets: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/dark-pool/recent', methods=['GET'])
+@cached_response
 def recent_dark_pool():
     """Get recent dark pool data."""
     try:
         limit = request.args.get('limit', default=10, type=int)
         ticker = request.args.get('ticker')
         
-        query = supabase.table(DARK_POOL_TABLE).select("*").order("date", {"ascending": False}).limit(limit)
-        
-        if ticker:
-            query = query.eq("ticker", ticker)
-        
-        response = query.execute()
-        
-        if not response.data:
-            return jsonify({"error": "No dark pool data available"}), 404
+        rows = _recent_rows(DARK_POOL_TABLE, RECENT_DARK_POOL_QUERY, limit, ticker=_eq(ticker))
         
-        return jsonify({"data": response.data})
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching dark pool data: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching dark pool data: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/option-flow/recent', methods=['GET'])
+@cached_response
 def recent_option_flow():
     """Get recent option flow data."""
     try:
@@ -203,25 +467,16 @@ def recent_option_flow():
         ticker = request.args.get('ticker')
         sentiment = request.args.get('sentiment')  # bullish, bearish, neutral
         
-        query = supabase.table(OPTION_FLOW_TABLE).select("*").order("date", {"ascending": False}).limit(limit)
+        rows = _recent_rows(OPTION_FLOW_TABLE, RECENT_OPTION_FLOW_QUERY, limit,
+                            ticker=_eq(ticker), sentiment=_eq(sentiment))
         
-        if ticker:
-            query = query.eq("ticker", ticker)
-        
-        if sentiment:
-            query = query.eq("sentiment", sentiment)
-        
-        response = query.execute()
-        
-        if not response.data:
-            return jsonify({"error": "No option flow data available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching option flow data: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching option flow data: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/alerts/recent', methods=['GET'])
+@cached_response
 def recent_alerts():
     """Get recent holdings change alerts."""
     try:
@@ -229,145 +484,132 @@ def recent_alerts():
         ticker = request.args.get('ticker')
         investor_id = request.args.get('investor_id')
         
-        query = supabase.table(ALERTS_TABLE).select("*").order("created_at", {"ascending": False}).limit(limit)
-        
-        if investor_id:
-            query = query.eq("investor_id", investor_id)
-        
-        response = query.execute()
-        
-        # If ticker filter is provided, filter the results after fetching
-        # (since changes are stored as JSON arrays)
-        result_data = response.data
-        if ticker and result_data:
-            filtered_data = []
-            for alert in result_data:
-                changes = alert.get("changes", [])
-                ticker_changes = [change for change in changes if change.get("ticker") == ticker]
-                if ticker_changes:
-                    # Clone the alert but replace changes with filtered changes
-                    filtered_alert = {**alert}
-                    filtered_alert["changes"] = ticker_changes
-                    filtered_data.append(filtered_alert)
-            result_data = filtered_data
-        
-        if not result_data:
-            return jsonify({"error": "No alerts available"}), 404
-        
-        return jsonify({"data": result_data})
+        if ticker:
+            # Filter on and narrow each alert's changes to the ticker in
+            # Postgres (see dashboard_queries.sql), so only matches are sent
+            response = supabase_ro.rpc(RECENT_ALERTS_FOR_TICKER_FUNCTION, {
+                "p_ticker": ticker,
+                "p_limit": limit,
+                "p_investor_id": investor_id
+            }).execute()
+            return ojsonify({"data": response.data or []})
+        
+        rows = _recent_rows(ALERTS_TABLE, RECENT_ALERTS_QUERY, limit, investor_id=_eq(investor_id))
+        
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching recent alerts: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching recent alerts: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/fundamentals/<ticker>', methods=['GET'])
+@cached_response
 def fundamentals(ticker):
     """Get fundamental data for a specific ticker."""
     try:
-        response = supabase.table(FUNDAMENTALS_TABLE).select("*").eq("ticker", ticker).order("timestamp", {"ascending": False}).limit(1).execute()
+        response = supabase_ro.table(FUNDAMENTALS_TABLE).select("*").eq("ticker", ticker).order("timestamp", desc=True).limit(1).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": f"No fundamental data available for {ticker}"}), 404
+            return ojsonify({"error": f"No fundamental data available for {ticker}"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching fundamentals for {ticker}: {e}", extra={"metadata": {"ticker": ticker}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching fundamentals for {ticker}: {e}", extra={"ticker": ticker})
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/fundamentals/insights/<ticker>', methods=['GET'])
+@cached_response
 def fundamental_insights(ticker):
     """Get AI-generated insights for a specific ticker's fundamentals."""
     try:
-        response = supabase.table(FUNDAMENTALS_TABLE).select("ticker,insights,timestamp").eq("ticker", ticker).order("timestamp", {"ascending": False}).limit(1).execute()
+        response = supabase_ro.table(FUNDAMENTALS_TABLE).select("ticker,insights,timestamp").eq("ticker", ticker).order("timestamp", desc=True).limit(1).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": f"No fundamental insights available for {ticker}"}), 404
+            return ojsonify({"error": f"No fundamental insights available for {ticker}"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching fundamental insights for {ticker}: {e}", extra={"metadata": {"ticker": ticker}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching fundamental insights for {ticker}: {e}", extra={"ticker": ticker})
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/economic-indicators', methods=['GET'])
+@cached_response(ttl=SLOW_CACHE_TTL)
 def economic_indicators():
     """Get economic indicator data."""
     try:
-        response = supabase.table(ECONOMIC_INDICATORS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
+        response = supabase_ro.table(ECONOMIC_INDICATORS_TABLE).select("*").order("timestamp", desc=True).limit(1).execute()
         
         if not response.data or len(response.data) == 0:
-            return jsonify({"error": "No economic indicator data available"}), 404
+            return ojsonify({"error": "No economic indicator data available"}, 404)
         
-        return jsonify({"data": response.data[0]})
+        return ojsonify({"data": response.data[0]})
     except Exception as e:
-        logger.error(f"Error fetching economic indicators: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching economic indicators: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/economic-news', methods=['GET'])
+@cached_response(ttl=SLOW_CACHE_TTL)
 def economic_news():
     """Get economic news with sentiment analysis."""
     try:
         limit = request.args.get('limit', default=20, type=int)
         sentiment = request.args.get('sentiment')  # positive, negative, neutral
         
-        response = supabase.table(ECONOMIC_NEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        
-        if not response.data or len(response.data) == 0:
-            return jsonify({"error": "No economic news available"}), 404
-        
-        # Get the most recent news collection
-        news_collection = response.data[0]
-        news_items = news_collection.get("news", [])
-        
-        # Filter by sentiment if requested
-        if sentiment and news_items:
-            news_items = [item for item in news_items if item.get("sentiment_label") == sentiment]
+        # The latest collection, filtered and limited in Postgres
+        response = supabase_ro.rpc(LATEST_ECONOMIC_NEWS_FUNCTION, {
+            "p_sentiment": sentiment,
+            "p_limit": limit
+        }).execute()
         
-        # Limit the number of news items
-        news_items = news_items[:limit]
-        
-        result = {
-            "timestamp": news_collection.get("timestamp"),
-            "news": news_items
-        }
+        if not response.data:
+            return ojsonify({"error": "No economic news available"}, 404)
         
-        return jsonify({"data": result})
+        return ojsonify({"data": response.data})
     except Exception as e:
-        logger.error(f"Error fetching economic news: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching economic news: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/investors', methods=['GET'])
+@cached_response(ttl=STATIC_CACHE_TTL)
 def get_investors():
     """Get list of tracked investors."""
     try:
-        response = supabase.table(INVESTORS_TABLE).select("*").execute()
-        
-        if not response.data:
-            return jsonify({"error": "No investors available"}), 404
+        limit, offset = _page_args()
+        fields = _fields_arg("*")
+        if fields is None:
+            return ojsonify({"error": "Invalid fields parameter"}, 400)
+        
+        response = supabase_ro.table(INVESTORS_TABLE) \
+            .select(fields) \
+            .order("cik") \
+            .range(offset, offset + limit - 1) \
+            .execute()
         
-        return jsonify({"data": response.data})
+        rows = response.data or []
+        return ostream(rows, next_offset=_next_offset(rows, limit, offset))
     except Exception as e:
-        logger.error(f"Error fetching investors: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching investors: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/holdings/investor/<investor_id>', methods=['GET'])
+@cached_response
 def investor_holdings(investor_id):
     """Get holdings for a specific investor."""
     try:
-        response = supabase.table(HOLDINGS_TABLE) \
+        response = supabase_ro.table(HOLDINGS_TABLE) \
             .select("*") \
             .eq("investor_id", investor_id) \
-            .order("filing_date", {"ascending": False}) \
+            .order("filing_date", desc=True) \
             .limit(1) \
             .execute()
         
-        if not response.data or len(response.data) == 0:
-            return jsonify({"error": f"No holdings available for investor {investor_id}"}), 404
-        
-        return jsonify({"data": response.data[0]})
+        # No filing yet is an empty result, not a missing resource
+        return ojsonify({"data": response.data[0] if response.data else None})
     except Exception as e:
-        logger.error(f"Error fetching holdings: {e}", extra={"metadata": {"investor_id": investor_id}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching holdings: {e}", extra={"investor_id": investor_id})
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/economic-reports/recent', methods=['GET'])
+@cached_response
 def recent_economic_reports():
     """Get recent economic reports."""
     try:
@@ -375,266 +617,259 @@ def recent_economic_reports():
         source = request.args.get('source')
         category = request.args.get('category')
         
-        query = supabase.table(ECONOMIC_REPORTS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(limit)
-        
-        if source:
-            query = query.eq("source", source)
+        rows = _recent_rows(ECONOMIC_REPORTS_TABLE, RECENT_REPORTS_QUERY, limit,
+                            source=_eq(source), category=_eq(category))
         
-        if category:
-            query = query.eq("category", category)
-        
-        response = query.execute()
-        
-        if not response.data:
-            return jsonify({"error": "No economic reports available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching economic reports: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching economic reports: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/economic-reports/sources', methods=['GET'])
+@cached_response(ttl=STATIC_CACHE_TTL)
 def economic_report_sources():
     """Get list of available economic report sources."""
     try:
-        response = supabase.table(ECONOMIC_REPORTS_TABLE).select("source").execute()
+        response = supabase_ro.table(ECONOMIC_REPORT_SOURCES_VIEW).select("source").execute()
+        sources = [item["source"] for item in response.data or []]
         
-        if not response.data:
-            return jsonify({"error": "No economic report sources available"}), 404
-        
-        # Extract unique sources
-        sources = list(set([item.get("source") for item in response.data if item.get("source")]))
-        
-        return jsonify({"data": sources})
+        return ojsonify({"data": sources})
     except Exception as e:
-        logger.error(f"Error fetching economic report sources: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching economic report sources: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/economic-reports/categories', methods=['GET'])
+@cached_response(ttl=STATIC_CACHE_TTL)
 def economic_report_categories():
     """Get list of available economic report categories."""
     try:
-        response = supabase.table(ECONOMIC_REPORTS_TABLE).select("category").execute()
+        response = supabase_ro.table(ECONOMIC_REPORT_CATEGORIES_VIEW).select("category").execute()
+        categories = [item["category"] for item in response.data or []]
         
-        if not response.data:
-            return jsonify({"error": "No economic report categories available"}), 404
-        
-        # Extract unique categories
-        categories = list(set([item.get("category") for item in response.data if item.get("category")]))
-        
-        return jsonify({"data": categories})
+        return ojsonify({"data": categories})
     except Exception as e:
-        logger.error(f"Error fetching economic report categories: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching economic report categories: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/interviews/recent', methods=['GET'])
+@cached_response
 def recent_interviews():
     """Get recent interview transcriptions."""
     try:
         limit = request.args.get('limit', default=10, type=int)
         speaker = request.args.get('speaker')
         
-        query = supabase.table(INTERVIEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(limit)
-        
-        if speaker:
-            query = query.eq("speaker", speaker)
-        
-        response = query.execute()
+        rows = _recent_rows(INTERVIEWS_TABLE, RECENT_INTERVIEWS_QUERY, limit, speaker=_eq(speaker))
         
-        if not response.data:
-            return jsonify({"error": "No interview transcriptions available"}), 404
-        
-        return jsonify({"data": response.data})
+        return ojsonify({"data": rows})
     except Exception as e:
-        logger.error(f"Error fetching interview transcriptions: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching interview transcriptions: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/interviews/speakers', methods=['GET'])
+@cached_response(ttl=STATIC_CACHE_TTL)
 def interview_speakers():
     """Get list of available interview speakers."""
     try:
-        response = supabase.table(INTERVIEWS_TABLE).select("speaker").execute()
-        
-        if not response.data:
-            return jsonify({"error": "No interview speakers available"}), 404
+        response = supabase_ro.table(INTERVIEW_SPEAKERS_VIEW).select("speaker").execute()
+        speakers = [item["speaker"] for item in response.data or []]
         
-        # Extract unique speakers
-        speakers = list(set([item.get("speaker") for item in response.data if item.get("speaker")]))
-        
-        return jsonify({"data": speakers})
+        return ojsonify({"data": speakers})
     except Exception as e:
-        logger.error(f"Error fetching interview speakers: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        logger.error(f"Error fetching interview speakers: {e}")
+        return ojsonify({"error": str(e)}, 500)
 
 @app.route('/api/dashboard/summary', methods=['GET'])
+@cached_response
 def dashboard_summary():
     """Get a summary of all data for the dashboard."""
     try:
-        # Market data summary
-        market_response = supabase.table(MARKET_TABLE).select("ticker,price,rsi").limit(10).execute()
-        market_data = market_response.data if market_response.data else []
+        summary = _cached_dashboard_summary()
+        if summary is None:
+            summary = _live_dashboard_summary()
         
-        # Recent alerts
-        alerts_response = supabase.table(ALERTS_TABLE).select("*").order("created_at", {"ascending": False}).limit(5).execute()
-        alerts_data = alerts_response.data if alerts_response.data else []
+        return ojsonify({**summary, "timestamp": datetime.now(timezone.utc)})
+    except Exception as e:
+        logger.error(f"Error creating dashboard summary: {e}")
+        return ojsonify({"error": str(e)}, 500)
+
+def _cached_dashboard_summary():
+    """Return the precomputed dashboard summary, or None if missing or stale."""
+    try:
+        response = supabase_ro.table(DASHBOARD_SUMMARY_VIEW).select("summary,refreshed_at").limit(1).execute()
+        if not response.data:
+            return None
         
-        # Recent Twitter mentions
-        twitter_response = supabase.table(TWITTER_TABLE).select("*").order("created_at", {"ascending": False}).limit(5).execute()
-        twitter_data = twitter_response.data if twitter_response.data else []
+        row = response.data[0]
+        refreshed_at = datetime.fromisoformat(row["refreshed_at"])
+        if datetime.now(timezone.utc) - refreshed_at > DASHBOARD_SUMMARY_MAX_AGE:
+            return None
         
+        return row["summary"]
+    except Exception as e:
+        logger.warning(f"Dashboard summary view unavailable, using live queries: {e}")
+        return None
+
+def _live_dashboard_summary():
+    """Build the dashboard summary in Postgres with one RPC call."""
+    return _rpc_payload(DASHBOARD_SUMMARY_FUNCTION, _build_dashboard_summary)
+
+def _rpc_payload(function, fallback):
+    """Return the JSON payload built by a Postgres function, or fallback() if it's unavailable."""
+    try:
+        response = supabase_ro.rpc(function, {}).execute()
+        if response.data:
+            return response.data
+    except Exception as e:
+        logger.warning(f"{function} unavailable, using live queries: {e}")
+    return fallback()
+
+def _build_dashboard_summary():
+    """Build the dashboard summary from live queries, issued concurrently."""
+    today, three_days = date_bounds(3)
+    
+    (market_data, alerts_data, twitter_data, top_stocks_rows, econ_rows,
+     economic_reports, interviews, earnings_data) = _execute_all([
+        # Market data summary
+        supabase_ro.table(MARKET_TABLE).select("ticker,price,rsi").limit(10),
+        # Recent alerts
+        supabase_ro.table(ALERTS_TABLE).select("*").order("created_at", desc=True).limit(5),
+        # Recent Twitter mentions
+        supabase_ro.table(TWITTER_TABLE).select("*").order("created_at", desc=True).limit(5),
         # Top stocks
-        top_stocks_response = supabase.table(TOP_STOCKS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        top_stocks_data = top_stocks_response.data[0] if top_stocks_response.data else {}
-        
-        # Economic indicators summary (just GDP, inflation, unemployment)
-        econ_response = supabase.table(ECONOMIC_INDICATORS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        econ_data = {}
-        if econ_response.data and econ_response.data[0].get("indicators"):
-            indicators = econ_response.data[0].get("indicators", {})
-            econ_data = {
-                "gdp": indicators.get("gdp", {}),
-                "inflation": indicators.get("inflation", {}),
-                "unemployment": indicators.get("unemployment", {})
-            }
-        
-        # Economic news headlines (latest 3 with non-neutral sentiment)
-        econ_news_response = supabase.table(ECONOMIC_NEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        econ_news = []
-        if econ_news_response.data and econ_news_response.data[0].get("news"):
-            all_news = econ_news_response.data[0].get("news", [])
-            important_news = [n for n in all_news if n.get("sentiment_label") != "neutral"][:3]
-            econ_news = important_news
-        
+        supabase_ro.table(TOP_STOCKS_TABLE).select("*").order("timestamp", desc=True).limit(1),
+        # Latest economic indicators and news
+        supabase_ro.table(DASHBOARD_ECON_VIEW).select("indicators,news").limit(1),
         # Recent economic reports
-        economic_reports_response = supabase.table(ECONOMIC_REPORTS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(3).execute()
-        economic_reports = economic_reports_response.data if economic_reports_response.data else []
-        
+        supabase_ro.table(ECONOMIC_REPORTS_TABLE).select("*").order("timestamp", desc=True).limit(3),
         # Recent interviews
-        interviews_response = supabase.table(INTERVIEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(3).execute()
-        interviews = interviews_response.data if interviews_response.data else []
-        
+        supabase_ro.table(INTERVIEWS_TABLE).select("*").order("timestamp", desc=True).limit(3),
         # Upcoming earnings (next 3 days)
-        today = datetime.now().date()
-        three_days = today + timedelta(days=3)
-        earnings_response = supabase.table(EARNINGS_CALENDAR_TABLE) \
+        supabase_ro.table(EARNINGS_CALENDAR_TABLE) \
             .select("*") \
-            .gte("report_date", today.isoformat()) \
-            .lte("report_date", three_days.isoformat()) \
-            .order("report_date", {"ascending": True}) \
-            .limit(5) \
-            .execute()
-        earnings_data = earnings_response.data if earnings_response.data else []
-        
-        return jsonify({
-            "market_data": market_data,
-            "alerts": alerts_data,
-            "twitter_mentions": twitter_data,
-            "top_stocks": top_stocks_data,
-            "economic_indicators": econ_data,
-            "economic_news": econ_news,
-            "economic_reports": economic_reports,
-            "interviews": interviews,
-            "upcoming_earnings": earnings_data,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        logger.error(f"Error creating dashboard summary: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+            .gte("report_date", today) \
+            .lte("report_date", three_days) \
+            .order("report_date") \
+            .limit(5)
+    ])
+    
+    top_stocks_data = top_stocks_rows[0] if top_stocks_rows else {}
+    econ = econ_rows[0] if econ_rows else {}
+    
+    # Economic indicators summary (just GDP, inflation, unemployment)
+    econ_data = {}
+    if econ.get("indicators"):
+        indicators = econ["indicators"]
+        econ_data = {
+            "gdp": indicators.get("gdp", {}),
+            "inflation": indicators.get("inflation", {}),
+            "unemployment": indicators.get("unemployment", {})
+        }
+    
+    # Economic news headlines (latest 3 with non-neutral sentiment)
+    econ_news = [n for n in econ.get("news") or [] if n.get("sentiment_label") != "neutral"][:3]
+    
+    return {
+        "market_data": market_data,
+        "alerts": alerts_data,
+        "twitter_mentions": twitter_data,
+        "top_stocks": top_stocks_data,
+        "economic_indicators": econ_data,
+        "economic_news": econ_news,
+        "economic_reports": economic_reports,
+        "interviews": interviews,
+        "upcoming_earnings": earnings_data
+    }
 
 @app.route('/api/dashboard/trader', methods=['GET'])
+@cached_response
 def trader_dashboard():
     """Get a summary of trader-specific data for the dashboard."""
     try:
+        dashboard = _rpc_payload(TRADER_DASHBOARD_FUNCTION, _build_trader_dashboard)
+        return ojsonify({**dashboard, "timestamp": datetime.now(timezone.utc)})
+    except Exception as e:
+        logger.error(f"Error creating trader dashboard: {e}")
+        return ojsonify({"error": str(e)}, 500)
+
+def _build_trader_dashboard():
+    """Build the trader dashboard from live queries, issued concurrently."""
+    market_data, top_stocks_rows, twitter_data, option_data, dark_pool_data = _execute_all([
         # Market data with technical indicators
-        market_response = supabase.table(MARKET_TABLE).select("ticker,price,volume,rsi,macd,macd_signal").limit(10).execute()
-        market_data = market_response.data if market_response.data else []
-        
+        supabase_ro.table(MARKET_TABLE).select("ticker,price,volume,rsi,macd,macd_signal").limit(10),
         # Top stocks
-        top_stocks_response = supabase.table(TOP_STOCKS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        top_stocks_data = top_stocks_response.data[0] if top_stocks_response.data else {}
-        
+        supabase_ro.table(TOP_STOCKS_TABLE).select("*").order("timestamp", desc=True).limit(1),
         # Recent Twitter mentions
-        twitter_response = supabase.table(TWITTER_TABLE).select("*").order("created_at", {"ascending": False}).limit(10).execute()
-        twitter_data = twitter_response.data if twitter_response.data else []
-        
+        supabase_ro.table(TWITTER_TABLE).select("*").order("created_at", desc=True).limit(10),
         # Option flow data
-        option_response = supabase.table(OPTION_FLOW_TABLE).select("*").order("date", {"ascending": False}).limit(10).execute()
-        option_data = option_response.data if option_response.data else []
-        
+        supabase_ro.table(OPTION_FLOW_TABLE).select("*").order("date", desc=True).limit(10),
         # Dark pool data
-        dark_pool_response = supabase.table(DARK_POOL_TABLE).select("*").order("date", {"ascending": False}).limit(10).execute()
-        dark_pool_data = dark_pool_response.data if dark_pool_response.data else []
-        
-        return jsonify({
-            "market_data": market_data,
-            "top_stocks": top_stocks_data,
-            "twitter_mentions": twitter_data,
-            "option_flow": option_data,
-            "dark_pool": dark_pool_data,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        logger.error(f"Error creating trader dashboard: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+        supabase_ro.table(DARK_POOL_TABLE).select("*").order("date", desc=True).limit(10)
+    ])
+    
+    return {
+        "market_data": market_data,
+        "top_stocks": top_stocks_rows[0] if top_stocks_rows else {},
+        "twitter_mentions": twitter_data,
+        "option_flow": option_data,
+        "dark_pool": dark_pool_data
+    }
 
 @app.route('/api/dashboard/investor', methods=['GET'])
+@cached_response
 def investor_dashboard():
     """Get a summary of investor-specific data for the dashboard."""
     try:
+        dashboard = _rpc_payload(INVESTOR_DASHBOARD_FUNCTION, _build_investor_dashboard)
+        return ojsonify({**dashboard, "timestamp": datetime.now(timezone.utc)})
+    except Exception as e:
+        logger.error(f"Error creating investor dashboard: {e}")
+        return ojsonify({"error": str(e)}, 500)
+
+def _build_investor_dashboard():
+    """Build the investor dashboard from live queries, issued concurrently."""
+    today, one_week = date_bounds(7)
+    
+    (market_data, econ_rows, economic_reports, interviews,
+     alerts_data, filings_data, earnings_data) = _execute_all([
         # Market data summary
-        market_response = supabase.table(MARKET_TABLE).select("ticker,price,price_change_pct").limit(10).execute()
-        market_data = market_response.data if market_response.data else []
-        
-        # Economic indicators
-        econ_response = supabase.table(ECONOMIC_INDICATORS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        econ_data = econ_response.data[0].get("indicators", {}) if econ_response.data else {}
-        
-        # Economic news
-        econ_news_response = supabase.table(ECONOMIC_NEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(1).execute()
-        econ_news = econ_news_response.data[0].get("news", [])[:10] if econ_news_response.data else []
-        
+        supabase_ro.table(MARKET_TABLE).select("ticker,price,price_change_pct").limit(10),
+        # Latest economic indicators and news
+        supabase_ro.table(DASHBOARD_ECON_VIEW).select("indicators,news").limit(1),
         # Economic reports
-        economic_reports_response = supabase.table(ECONOMIC_REPORTS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(5).execute()
-        economic_reports = economic_reports_response.data if economic_reports_response.data else []
-        
+        supabase_ro.table(ECONOMIC_REPORTS_TABLE).select("*").order("timestamp", desc=True).limit(5),
         # Interviews
-        interviews_response = supabase.table(INTERVIEWS_TABLE).select("*").order("timestamp", {"ascending": False}).limit(5).execute()
-        interviews = interviews_response.data if interviews_response.data else []
-        
+        supabase_ro.table(INTERVIEWS_TABLE).select("*").order("timestamp", desc=True).limit(5),
         # Holdings alerts
-        alerts_response = supabase.table(ALERTS_TABLE).select("*").order("created_at", {"ascending": False}).limit(10).execute()
-        alerts_data = alerts_response.data if alerts_response.data else []
-        
+        supabase_ro.table(ALERTS_TABLE).select("*").order("created_at", desc=True).limit(10),
         # SEC filings
-        filings_response = supabase.table(SEC_FILINGS_TABLE).select("*").order("filing_date", {"ascending": False}).limit(10).execute()
-        filings_data = filings_response.data if filings_response.data else []
-        
+        supabase_ro.table(SEC_FILINGS_TABLE).select("*").order("filing_date", desc=True).limit(10),
         # Earnings calendar (next 7 days)
-        today = datetime.now().date()
-        one_week = today + timedelta(days=7)
-        earnings_response = supabase.table(EARNINGS_CALENDAR_TABLE) \
+        supabase_ro.table(EARNINGS_CALENDAR_TABLE) \
             .select("*") \
-            .gte("report_date", today.isoformat()) \
-            .lte("report_date", one_week.isoformat()) \
-            .order("report_date", {"ascending": True}) \
-            .limit(15) \
-            .execute()
-        earnings_data = earnings_response.data if earnings_response.data else []
-        
-        return jsonify({
-            "market_data": market_data,
-            "economic_indicators": econ_data,
-            "economic_news": econ_news,
-            "economic_reports": economic_reports,
-            "interviews": interviews,
-            "holdings_alerts": alerts_data,
-            "sec_filings": filings_data,
-            "earnings_calendar": earnings_data,
-            "timestamp": datetime.now().isoformat()
-        })
-    except Exception as e:
-        logger.error(f"Error creating investor dashboard: {e}", extra={"metadata": {}})
-        return jsonify({"error": str(e)}), 500
+            .gte("report_date", today) \
+            .lte("report_date", one_week) \
+            .order("report_date") \
+            .limit(15)
+    ])
+    
+    econ = econ_rows[0] if econ_rows else {}
+    
+    return {
+        "market_data": market_data,
+        "economic_indicators": econ.get("indicators") or {},
+        "economic_news": (econ.get("news") or [])[:10],
+        "economic_reports": economic_reports,
+        "interviews": interviews,
+        "holdings_alerts": alerts_data,
+        "sec_filings": filings_data,
+        "earnings_calendar": earnings_data
+    }
 
 if __name__ == "__main__":
-    app.run(debug=True) 
\ No newline at end of file
+    # The Flask dev server handles one request at a time; it's only for local
+    # debugging. Serve production traffic with the Procfile's gunicorn command.
+    if os.getenv("FLASK_DEBUG", "false").lower() in ("1", "true"):
+        app.run(debug=True)
+    else:
+        raise SystemExit("Run the dashboard with gunicorn (see Procfile), or set FLASK_DEBUG=1 for the dev server") 
\ No newline at end of file
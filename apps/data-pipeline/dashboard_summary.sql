@@ -0,0 +1,155 @@
+-- Builds the whole /api/dashboard/summary payload in one query, so the API
+-- makes a single round trip instead of querying nine tables itself
+CREATE OR REPLACE FUNCTION get_dashboard_summary()
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+SELECT json_build_object(
+    'market_data', COALESCE((
+        SELECT json_agg(m) FROM (SELECT ticker, price, rsi FROM market_data LIMIT 10) m
+    ), '[]'::json),
+    'alerts', COALESCE((
+        SELECT json_agg(a) FROM (SELECT * FROM holdings_alerts ORDER BY created_at DESC LIMIT 5) a
+    ), '[]'::json),
+    'twitter_mentions', COALESCE((
+        SELECT json_agg(t) FROM (SELECT * FROM twitter_data ORDER BY created_at DESC LIMIT 5) t
+    ), '[]'::json),
+    'top_stocks', COALESCE((
+        SELECT row_to_json(s) FROM (SELECT * FROM top_stocks ORDER BY timestamp DESC LIMIT 1) s
+    ), '{}'::json),
+    -- Just GDP, inflation and unemployment from the latest indicators
+    'economic_indicators', COALESCE((
+        SELECT CASE WHEN indicators IS NULL THEN '{}'::json ELSE json_build_object(
+            'gdp', COALESCE(indicators->'gdp', '{}'),
+            'inflation', COALESCE(indicators->'inflation', '{}'),
+            'unemployment', COALESCE(indicators->'unemployment', '{}')
+        ) END
+        FROM economic_indicators ORDER BY timestamp DESC LIMIT 1
+    ), '{}'::json),
+    -- Latest 3 headlines with non-neutral sentiment
+    'economic_news', COALESCE((
+        SELECT json_agg(item.value ORDER BY item.ordinality)
+        FROM (SELECT news FROM economic_news ORDER BY timestamp DESC LIMIT 1) latest,
+        LATERAL (
+            SELECT value, ordinality
+            FROM json_array_elements(latest.news::json) WITH ORDINALITY
+            WHERE value->>'sentiment_label' IS DISTINCT FROM 'neutral'
+            ORDER BY ordinality
+            LIMIT 3
+        ) item
+    ), '[]'::json),
+    'economic_reports', COALESCE((
+        SELECT json_agg(r) FROM (SELECT * FROM economic_reports ORDER BY timestamp DESC LIMIT 3) r
+    ), '[]'::json),
+    'interviews', COALESCE((
+        SELECT json_agg(i) FROM (SELECT * FROM interviews ORDER BY timestamp DESC LIMIT 3) i
+    ), '[]'::json),
+    -- Upcoming earnings (next 3 days)
+    'upcoming_earnings', COALESCE((
+        SELECT json_agg(e) FROM (
+            SELECT * FROM earnings_calendar
+            WHERE report_date >= CURRENT_DATE AND report_date <= CURRENT_DATE + 3
+            ORDER BY report_date ASC
+            LIMIT 5
+        ) e
+    ), '[]'::json)
+);
+$$;
+
+-- Precomputed payload so the endpoint usually reads one row rather than
+-- running the function on every request
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_summary_mv AS
+SELECT
+    1 AS id,
+    get_dashboard_summary() AS summary,
+    now() AS refreshed_at;
+
+-- A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS dashboard_summary_mv_id_idx ON dashboard_summary_mv (id);
+
+-- Called by the scheduler to rebuild the summary without blocking readers
+CREATE OR REPLACE FUNCTION refresh_dashboard_summary()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_summary_mv;
+END;
+$$;
+
+-- Payload for /api/dashboard/trader in one query
+CREATE OR REPLACE FUNCTION get_trader_dashboard()
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+SELECT json_build_object(
+    'market_data', COALESCE((
+        SELECT json_agg(m) FROM (
+            SELECT ticker, price, volume, rsi, macd, macd_signal FROM market_data LIMIT 10
+        ) m
+    ), '[]'::json),
+    'top_stocks', COALESCE((
+        SELECT row_to_json(s) FROM (SELECT * FROM top_stocks ORDER BY timestamp DESC LIMIT 1) s
+    ), '{}'::json),
+    'twitter_mentions', COALESCE((
+        SELECT json_agg(t) FROM (SELECT * FROM twitter_data ORDER BY created_at DESC LIMIT 10) t
+    ), '[]'::json),
+    'option_flow', COALESCE((
+        SELECT json_agg(o) FROM (SELECT * FROM option_flow_data ORDER BY date DESC LIMIT 10) o
+    ), '[]'::json),
+    'dark_pool', COALESCE((
+        SELECT json_agg(d) FROM (SELECT * FROM dark_pool_data ORDER BY date DESC LIMIT 10) d
+    ), '[]'::json)
+);
+$$;
+
+-- Payload for /api/dashboard/investor in one query
+CREATE OR REPLACE FUNCTION get_investor_dashboard()
+RETURNS json
+LANGUAGE sql
+STABLE
+AS $$
+SELECT json_build_object(
+    'market_data', COALESCE((
+        SELECT json_agg(m) FROM (SELECT ticker, price, price_change_pct FROM market_data LIMIT 10) m
+    ), '[]'::json),
+    'economic_indicators', COALESCE((
+        SELECT indicators::json FROM economic_indicators ORDER BY timestamp DESC LIMIT 1
+    ), '{}'::json),
+    -- First 10 headlines from the latest news collection
+    'economic_news', COALESCE((
+        SELECT json_agg(item.value ORDER BY item.ordinality)
+        FROM (SELECT news FROM economic_news ORDER BY timestamp DESC LIMIT 1) latest,
+        LATERAL (
+            SELECT value, ordinality
+            FROM json_array_elements(latest.news::json) WITH ORDINALITY
+            ORDER BY ordinality
+            LIMIT 10
+        ) item
+    ), '[]'::json),
+    'economic_reports', COALESCE((
+        SELECT json_agg(r) FROM (SELECT * FROM economic_reports ORDER BY timestamp DESC LIMIT 5) r
+    ), '[]'::json),
+    'interviews', COALESCE((
+        SELECT json_agg(i) FROM (SELECT * FROM interviews ORDER BY timestamp DESC LIMIT 5) i
+    ), '[]'::json),
+    'holdings_alerts', COALESCE((
+        SELECT json_agg(a) FROM (SELECT * FROM holdings_alerts ORDER BY created_at DESC LIMIT 10) a
+    ), '[]'::json),
+    'sec_filings', COALESCE((
+        SELECT json_agg(f) FROM (SELECT * FROM sec_filings ORDER BY filing_date DESC LIMIT 10) f
+    ), '[]'::json),
+    -- Upcoming earnings (next 7 days)
+    'earnings_calendar', COALESCE((
+        SELECT json_agg(e) FROM (
+            SELECT * FROM earnings_calendar
+            WHERE report_date >= CURRENT_DATE AND report_date <= CURRENT_DATE + 7
+            ORDER BY report_date ASC
+            LIMIT 15
+        ) e
+    ), '[]'::json)
+);
+$$;
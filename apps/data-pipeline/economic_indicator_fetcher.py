@@ -1,14 +1,16 @@
+import asyncio
+import functools
 import logging
-import json
 import os
 from datetime import datetime, timedelta
-import time
 from supabase import create_client
+from postgrest.types import ReturnMethod
 from dotenv import load_dotenv
-import requests
-import pandas as pd
-import pandas_datareader.data as web
-from textblob import TextBlob
+import aiohttp
+from diskcache import Cache
+import ijson
+import orjson
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -28,266 +30,354 @@ FRED_API_KEY = os.getenv("FRED_API_KEY")
 # Table in Supabase
 ECONOMIC_INDICATORS_TABLE = "economic_indicators"
 ECONOMIC_NEWS_TABLE = "economic_news"
+# The indicators table holds a single record, overwritten on every run
+ECONOMIC_INDICATORS_ROW_ID = 1
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+FRED_OBSERVATIONS_URL = "https://api.stlouisfed.org/fred/series/observations"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Alpha Vantage's free tier allows 5 requests per minute
+ALPHA_VANTAGE_RATE_LIMIT = 5
+ALPHA_VANTAGE_RATE_PERIOD = 60  # seconds
+
+# Connections kept open across Alpha Vantage and FRED
+HTTP_POOL_SIZE = 32
+
+# Responses worth retrying; the wait follows Retry-After when the server sends it
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+_backoff = wait_exponential(multiplier=2, min=2, max=60)
+
+# Alpha Vantage indicator series, keyed by their name in the indicators record
+AV_INDICATORS = {
+    "gdp": {
+        "function": "REAL_GDP",
+        "interval": "quarterly",
+        "name": "GDP",
+        "description": "Gross Domestic Product (GDP)"
+    },
+    "inflation": {
+        "function": "CPI",
+        "interval": "monthly",
+        "name": "CPI",
+        "description": "Consumer Price Index (Inflation)"
+    },
+    "unemployment": {
+        "function": "UNEMPLOYMENT",
+        "interval": None,
+        "name": "UNEMPLOYMENT",
+        "description": "Unemployment Rate"
+    },
+    "interest_rates": {
+        "function": "FEDERAL_FUNDS_RATE",
+        "interval": "monthly",
+        "name": "FEDERAL_FUNDS_RATE",
+        "description": "Federal Funds Rate"
+    },
+    "retail_sales": {
+        "function": "RETAIL_SALES",
+        "interval": None,
+        "name": "RETAIL_SALES",
+        "description": "Retail Sales"
+    }
+}
+# Most recent points kept per series (3 years quarterly, 12 months monthly)
+AV_SERIES_POINTS = 12
+
+# Alpha Vantage's news sentiment labels, collapsed to the positive/negative/
+# neutral labels the dashboard queries filter on
+AV_SENTIMENT_LABELS = {
+    "bullish": "positive",
+    "somewhat-bullish": "positive",
+    "neutral": "neutral",
+    "somewhat-bearish": "negative",
+    "bearish": "negative"
+}
+
+# FRED series to collect alongside the Alpha Vantage indicators
+FRED_INDICATORS = {
+    'INDPRO': 'Industrial Production Index',
+    'HOUST': 'Housing Starts',
+    'DCOILWTICO': 'Crude Oil Prices',
+    'DGS10': '10-Year Treasury Constant Maturity Rate',
+    'VIXCLS': 'CBOE Volatility Index (VIX)'
+}
+
+# Persistent cache of API responses. The series update at most daily, so a
+# response is reused for the rest of the day it was fetched on; the last good
+# response is also kept to fall back on when the API is down or rate limited.
+response_cache = Cache(os.path.join(".cache", "economic_indicators"))
+RESPONSE_CACHE_EXPIRY = 24 * 3600  # seconds
+# Alpha Vantage answers rate-limited or invalid calls with 200 and one of these
+AV_ERROR_KEYS = ("Note", "Information", "Error Message")
+
+def _cache_key(source, params):
+    """Return the cache key for a request, ignoring the API key."""
+    return f"{source}:" + "&".join(f"{k}={v}" for k, v in sorted(params.items()) if k != "apikey")
+
+class RateLimitError(Exception):
+    """Alpha Vantage refused a request because the rate limit was hit."""
+
+def _is_transient_error(exc):
+    """Return True for network errors, rate limiting and server failures worth retrying."""
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in RETRY_STATUS_CODES
+    return isinstance(exc, (RateLimitError, aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+def _retry_wait(retry_state):
+    """Wait as long as the server's Retry-After asks, otherwise back off exponentially."""
+    headers = getattr(retry_state.outcome.exception(), "headers", None) or {}
+    retry_after = headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return int(retry_after)
+    return _backoff(retry_state)
+
+@functools.lru_cache(maxsize=1)
+def _get_supabase():
+    """Return the Supabase client shared by every fetcher in this process."""
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+async def _read_series(stream, max_items):
+    """
+    Parse an Alpha Vantage series response, keeping only its first `max_items` points.
+    
+    The response is parsed incrementally and reading stops once enough points
+    have been collected, so the rest of the history is never decoded.
+    """
+    envelope = {}
+    rows = []
+    builder = None
+    async for prefix, event, value in ijson.parse_async(stream, use_float=True):
+        if prefix.startswith("data.item"):
+            if prefix == "data.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            if prefix == "data.item" and event == "end_map":
+                rows.append(builder.value)
+                if len(rows) >= max_items:
+                    break
+        elif prefix and "." not in prefix and event in ("string", "number"):
+            # Top-level fields such as name, interval, unit or Note
+            envelope[prefix] = value
+    
+    if rows:
+        envelope["data"] = rows
+    return envelope
+
+class RateLimiter:
+    """Allow at most `rate` acquisitions in any `period`-second window."""
+    
+    def __init__(self, rate, period):
+        self._slots = asyncio.Semaphore(rate)
+        self._period = period
+    
+    async def acquire(self):
+        """Wait for a free slot, which is handed back `period` seconds later."""
+        await self._slots.acquire()
+        asyncio.get_running_loop().call_later(self._period, self._slots.release)
 
 class EconomicIndicatorFetcher:
     def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
+        self.supabase = _get_supabase()
+        # The HTTP session and rate limiter are bound to the running event
+        # loop, so they are created on first use rather than here
+        self.session = None
+        self._av_limiter = None
+    
+    async def _get_session(self):
+        """Return the shared HTTP session, creating it inside the running loop."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=HEADERS,
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self.session
+    
+    @retry(
+        stop=stop_after_attempt(MAX_RETRIES),
+        wait=_retry_wait,
+        retry=retry_if_exception(_is_transient_error),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True
+    )
+    async def fetch_with_rate_limit(self, url, params=None, max_items=None):
+        """
+        Make API request with rate limiting, retrying transient failures
         
-    def fetch_with_rate_limit(self, url, params=None):
-        """Make API request with rate limiting and retries"""
-        max_retries = 3
-        retry_delay = 60  # Alpha Vantage has a limit of 5 requests per minute on free tier
+        With max_items, the response is a series and only its first
+        max_items data points are parsed.
+        """
+        if self._av_limiter is None:
+            self._av_limiter = RateLimiter(ALPHA_VANTAGE_RATE_LIMIT, ALPHA_VANTAGE_RATE_PERIOD)
         
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                
-                # Check if we've hit the API rate limit
-                if "Thank you for using Alpha Vantage" in response.text and "Our standard API rate limit" in response.text:
-                    logger.warning(f"Rate limit hit. Waiting {retry_delay} seconds before retry.")
-                    time.sleep(retry_delay)
-                    continue
-                    
-                return response.json()
-            except requests.RequestException as e:
-                logger.error(f"Request failed (attempt {attempt+1}/{max_retries}): {str(e)}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    raise
-
-    def fetch_gdp(self):
-        """Fetch GDP data from Alpha Vantage"""
-        logger.info("Fetching GDP data")
+        await self._av_limiter.acquire()
+        session = await self._get_session()
+        async with session.get(url, params=params) as response:
+            # A 429 raises here, and its Retry-After sets the wait before the next attempt
+            response.raise_for_status()
+            if max_items:
+                data = await _read_series(response.content, max_items)
+            else:
+                data = orjson.loads(await response.read())
         
-        try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "REAL_GDP",
-                "interval": "quarterly",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
-            
-            if "data" not in data or not data["data"]:
-                logger.warning("No GDP data available")
-                return None
-                
-            return {
-                "name": "GDP",
-                "description": "Gross Domestic Product (GDP)",
-                "unit": data.get("unit", ""),
-                "data": data.get("data", [])[:12]  # Last 3 years quarterly
-            }
-        except Exception as e:
-            logger.error(f"Error fetching GDP data: {str(e)}")
-            return None
-
-    def fetch_inflation(self):
-        """Fetch inflation (CPI) data from Alpha Vantage"""
-        logger.info("Fetching inflation data")
+        # Alpha Vantage also reports the per-minute limit with a 200 and a "Note"
+        if "Note" in data:
+            raise RateLimitError(f"Alpha Vantage rate limit hit for {params.get('function')}")
+            
+        return data
+    
+    async def _fetch_av(self, function, interval=None, max_items=None, **params):
+        """
+        Fetch one Alpha Vantage endpoint, sharing the rate limit with every other call.
         
-        try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "CPI",
-                "interval": "monthly",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
-            
-            if "data" not in data or not data["data"]:
-                logger.warning("No inflation (CPI) data available")
-                return None
-                
-            return {
-                "name": "CPI",
-                "description": "Consumer Price Index (Inflation)",
-                "unit": data.get("unit", ""),
-                "data": data.get("data", [])[:12]  # Last 12 months
-            }
-        except Exception as e:
-            logger.error(f"Error fetching inflation data: {str(e)}")
-            return None
-
-    def fetch_unemployment(self):
-        """Fetch unemployment data from Alpha Vantage"""
-        logger.info("Fetching unemployment data")
+        Responses are served from the disk cache for the rest of the day; if
+        the API fails, the last good response is returned instead.
+        """
+        params = {"function": function, "apikey": ALPHA_VANTAGE_API_KEY, **params}
+        if interval:
+            params["interval"] = interval
+        
+        key = _cache_key("av", params)
+        today_key = f"{key}:{datetime.now().date().isoformat()}"
+        cached = response_cache.get(today_key)
+        if cached is not None:
+            logger.info(f"Using cached {function} response")
+            return cached
         
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "UNEMPLOYMENT",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
-            
-            if "data" not in data or not data["data"]:
-                logger.warning("No unemployment data available")
-                return None
-                
-            return {
-                "name": "UNEMPLOYMENT",
-                "description": "Unemployment Rate",
-                "unit": data.get("unit", ""),
-                "data": data.get("data", [])[:12]  # Last 12 months
-            }
-        except Exception as e:
-            logger.error(f"Error fetching unemployment data: {str(e)}")
-            return None
+            data = await self.fetch_with_rate_limit(ALPHA_VANTAGE_URL, params, max_items)
+        except (RateLimitError, aiohttp.ClientError, asyncio.TimeoutError):
+            data = None
+            if f"last:{key}" not in response_cache:
+                raise
+        
+        if data and not any(error_key in data for error_key in AV_ERROR_KEYS):
+            response_cache.set(today_key, data, expire=RESPONSE_CACHE_EXPIRY)
+            response_cache.set(f"last:{key}", data)
+            return data
+        
+        stale = response_cache.get(f"last:{key}")
+        if stale is not None:
+            logger.warning(f"Alpha Vantage {function} request failed, using last cached response")
+            return stale
+        return data
 
-    def fetch_interest_rates(self):
-        """Fetch interest rate data from Alpha Vantage"""
-        logger.info("Fetching interest rate data")
+    async def fetch_av_series(self, kind):
+        """Fetch one of the AV_INDICATORS series from Alpha Vantage"""
+        indicator = AV_INDICATORS[kind]
+        logger.info(f"Fetching {kind} data")
         
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "FEDERAL_FUNDS_RATE",
-                "interval": "monthly",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
+            data = await self._fetch_av(indicator["function"], indicator["interval"], AV_SERIES_POINTS)
             
             if "data" not in data or not data["data"]:
-                logger.warning("No interest rate data available")
+                logger.warning(f"No {kind} data available")
                 return None
                 
             return {
-                "name": "FEDERAL_FUNDS_RATE",
-                "description": "Federal Funds Rate",
+                "name": indicator["name"],
+                "description": indicator["description"],
                 "unit": data.get("unit", ""),
-                "data": data.get("data", [])[:12]  # Last 12 months
+                "data": data["data"][:AV_SERIES_POINTS]
             }
         except Exception as e:
-            logger.error(f"Error fetching interest rate data: {str(e)}")
+            logger.error(f"Error fetching {kind} data: {str(e)}")
             return None
 
-    def fetch_retail_sales(self):
-        """Fetch retail sales data from Alpha Vantage"""
-        logger.info("Fetching retail sales data")
-        
+    async def _fetch_fred_series(self, code, description, start_date, end_date):
+        """Fetch one FRED series, reusing today's cached copy if there is one"""
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "RETAIL_SALES",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
-            
-            if "data" not in data or not data["data"]:
-                logger.warning("No retail sales data available")
-                return None
+            # Each series is fetched at most once a day
+            cache_key = f"fred:{code}:{end_date.date().isoformat()}"
+            data_points = response_cache.get(cache_key)
+            
+            if data_points is None:
+                params = {
+                    "series_id": code,
+                    "api_key": FRED_API_KEY,
+                    "file_type": "json",
+                    "observation_start": start_date.strftime("%Y-%m-%d"),
+                    "observation_end": end_date.strftime("%Y-%m-%d")
+                }
+                session = await self._get_session()
+                async with session.get(FRED_OBSERVATIONS_URL, params=params) as response:
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+                
+                observations = data.get("observations", [])
+                if not observations:
+                    logger.warning(f"No data available for {code}")
+                    return None
+                    
+                # Convert data to list of dictionaries, skipping missing
+                # values, which FRED marks with "."
+                data_points = [
+                    {"date": observation["date"], "value": observation["value"]}
+                    for observation in observations
+                    if observation["value"] != "."
+                ]
                 
+                response_cache.set(cache_key, data_points, expire=RESPONSE_CACHE_EXPIRY)
+            
+            logger.info(f"Successfully fetched {code} data from FRED")
             return {
-                "name": "RETAIL_SALES",
-                "description": "Retail Sales",
-                "unit": data.get("unit", ""),
-                "data": data.get("data", [])[:12]  # Last 12 months
+                "name": code,
+                "description": description,
+                "unit": "",  # FRED doesn't provide units consistently
+                "data": data_points
             }
         except Exception as e:
-            logger.error(f"Error fetching retail sales data: {str(e)}")
+            logger.error(f"Error fetching {code} from FRED: {str(e)}")
             return None
 
-    def fetch_fred_indicators(self):
+    async def fetch_fred_indicators(self):
         """Fetch additional indicators from FRED if API key is available"""
         if not FRED_API_KEY:
             logger.warning("No FRED API key provided, skipping FRED indicators")
             return {}
             
         logger.info("Fetching indicators from FRED")
-        indicators = {}
         
         try:
-            # Define indicators to fetch
-            fred_indicators = {
-                'INDPRO': 'Industrial Production Index',
-                'HOUST': 'Housing Starts',
-                'DCOILWTICO': 'Crude Oil Prices',
-                'DGS10': '10-Year Treasury Constant Maturity Rate',
-                'VIXCLS': 'CBOE Volatility Index (VIX)'
-            }
-            
             # Set date range
             end_date = datetime.now()
             start_date = end_date - timedelta(days=365)  # 1 year of data
             
-            for code, description in fred_indicators.items():
-                try:
-                    # Fetch data from FRED
-                    df = web.DataReader(code, 'fred', start_date, end_date, api_key=FRED_API_KEY)
-                    
-                    if df.empty:
-                        logger.warning(f"No data available for {code}")
-                        continue
-                        
-                    # Convert data to list of dictionaries
-                    data_points = []
-                    for date, value in df.itertuples():
-                        if pd.notnull(value):  # Skip NaN values
-                            data_points.append({
-                                "date": date.strftime("%Y-%m-%d"),
-                                "value": str(value)
-                            })
-                    
-                    indicators[code] = {
-                        "name": code,
-                        "description": description,
-                        "unit": "",  # FRED doesn't provide units consistently
-                        "data": data_points
-                    }
-                    
-                    logger.info(f"Successfully fetched {code} data from FRED")
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching {code} from FRED: {str(e)}")
-                    continue
-                    
-                # Wait to avoid hitting API rate limit
-                time.sleep(1)
-                
-            return indicators
+            # FRED allows 120 requests a minute, so every series is requested at once
+            results = await asyncio.gather(*(
+                self._fetch_fred_series(code, description, start_date, end_date)
+                for code, description in FRED_INDICATORS.items()
+            ))
+            return {code: data for code, data in zip(FRED_INDICATORS, results) if data}
             
         except Exception as e:
             logger.error(f"Error fetching FRED indicators: {str(e)}")
             return {}
 
-    def fetch_economic_news(self):
+    async def fetch_economic_news(self):
         """Fetch economic news from Alpha Vantage"""
         logger.info("Fetching economic news")
         
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                "function": "NEWS_SENTIMENT",
-                "topics": "economy,economic,inflation,fed,interest_rates,gdp",
-                "apikey": ALPHA_VANTAGE_API_KEY
-            }
-            
-            data = self.fetch_with_rate_limit(url, params)
+            data = await self._fetch_av("NEWS_SENTIMENT", topics="economy,economic,inflation,fed,interest_rates,gdp")
             
             if "feed" not in data or not data["feed"]:
                 logger.warning("No economic news available")
                 return None
                 
-            # Process news and add sentiment analysis
+            # Process news, keeping the sentiment Alpha Vantage scored for each item
             processed_news = []
             for item in data.get("feed", [])[:20]:  # Process top 20 news items
                 title = item.get("title", "")
                 
-                # Perform simple sentiment analysis using TextBlob
-                sentiment = TextBlob(title).sentiment.polarity
-                sentiment_label = "positive" if sentiment > 0.1 else "negative" if sentiment < -0.1 else "neutral"
+                sentiment = float(item.get("overall_sentiment_score") or 0.0)
+                sentiment_label = AV_SENTIMENT_LABELS.get(
+                    item.get("overall_sentiment_label", "Neutral").lower().replace("_", "-"), "neutral"
+                )
                 
                 processed_news.append({
                     "title": title,
@@ -315,22 +405,17 @@ class EconomicIndicatorFetcher:
         
         try:
             data_to_insert = {
+                "id": ECONOMIC_INDICATORS_ROW_ID,
                 "indicators": indicators,
                 "timestamp": timestamp
             }
             
-            # Check if we should update or insert
-            result = self.supabase.table(ECONOMIC_INDICATORS_TABLE).select("id").limit(1).execute()
-            
-            if result.data:
-                # Update the existing record
-                record_id = result.data[0]["id"]
-                result = self.supabase.table(ECONOMIC_INDICATORS_TABLE).update(data_to_insert).eq("id", record_id).execute()
-                logger.info(f"Updated economic indicators record (id: {record_id})")
-            else:
-                # Insert new record
-                result = self.supabase.table(ECONOMIC_INDICATORS_TABLE).insert(data_to_insert).execute()
-                logger.info("Inserted new economic indicators record")
+            # Insert or overwrite the record in one request, without the
+            # written record being echoed back
+            result = self.supabase.table(ECONOMIC_INDICATORS_TABLE).upsert(
+                data_to_insert, on_conflict="id", returning=ReturnMethod.minimal
+            ).execute()
+            logger.info(f"Upserted economic indicators record (id: {ECONOMIC_INDICATORS_ROW_ID})")
                 
             return result
         except Exception as e:
@@ -352,7 +437,7 @@ class EconomicIndicatorFetcher:
             }
             
             # We'll always create a new record for news since it's time-dependent
-            result = self.supabase.table(ECONOMIC_NEWS_TABLE).insert(data_to_insert).execute()
+            result = self.supabase.table(ECONOMIC_NEWS_TABLE).insert(data_to_insert, returning=ReturnMethod.minimal).execute()
             logger.info("Inserted new economic news record")
                 
             return result
@@ -360,61 +445,46 @@ class EconomicIndicatorFetcher:
             logger.error(f"Error inserting news: {str(e)}")
             return None
 
-    def run(self):
-        """Run the economic indicator fetcher to collect all data"""
+    async def close(self):
+        """Close the HTTP session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._av_limiter = None
+
+    async def run_async(self):
+        """Collect all indicators and news, fetching everything concurrently"""
         logger.info("Running economic indicator fetcher")
         
         try:
-            # Collect indicators from Alpha Vantage
-            indicators = {}
-            
-            # GDP
-            gdp_data = self.fetch_gdp()
-            if gdp_data:
-                indicators["gdp"] = gdp_data
-            time.sleep(15)  # Wait to avoid hitting API rate limit
-            
-            # Inflation
-            inflation_data = self.fetch_inflation()
-            if inflation_data:
-                indicators["inflation"] = inflation_data
-            time.sleep(15)
-            
-            # Unemployment
-            unemployment_data = self.fetch_unemployment()
-            if unemployment_data:
-                indicators["unemployment"] = unemployment_data
-            time.sleep(15)
-            
-            # Interest rates
-            interest_rate_data = self.fetch_interest_rates()
-            if interest_rate_data:
-                indicators["interest_rates"] = interest_rate_data
-            time.sleep(15)
-            
-            # Retail sales
-            retail_sales_data = self.fetch_retail_sales()
-            if retail_sales_data:
-                indicators["retail_sales"] = retail_sales_data
-            time.sleep(15)
-            
-            # FRED indicators
-            fred_indicators = self.fetch_fred_indicators()
+            # Alpha Vantage series, FRED series and news are all requested at
+            # once; the rate limiter spaces out the Alpha Vantage calls only
+            # as much as the API requires
+            av_results, fred_indicators, economic_news = await asyncio.gather(
+                asyncio.gather(*(self.fetch_av_series(kind) for kind in AV_INDICATORS)),
+                self.fetch_fred_indicators(),
+                self.fetch_economic_news()
+            )
+            indicators = {kind: data for kind, data in zip(AV_INDICATORS, av_results) if data}
             if fred_indicators:
                 indicators.update(fred_indicators)
             
-            # Insert all indicators
-            self.insert_indicators(indicators)
-            
-            # Economic news
-            economic_news = self.fetch_economic_news()
+            # Write indicators and news together
+            writes = [asyncio.to_thread(self.insert_indicators, indicators)]
             if economic_news:
-                self.insert_news(economic_news)
+                writes.append(asyncio.to_thread(self.insert_news, economic_news))
+            await asyncio.gather(*writes)
             
             logger.info("Economic indicator fetcher completed successfully")
             
         except Exception as e:
             logger.error(f"Error running economic indicator fetcher: {str(e)}")
+        finally:
+            await self.close()
+
+    def run(self):
+        """Run the economic indicator fetcher to collect all data"""
+        asyncio.run(self.run_async())
 
 def main():
     fetcher = EconomicIndicatorFetcher()
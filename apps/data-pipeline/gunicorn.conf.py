@@ -0,0 +1,14 @@
+import multiprocessing
+import os
+
+# Gunicorn settings for dashboard_server.py. Every endpoint spends its time
+# waiting on Supabase, so gevent workers multiplex many requests each instead
+# of serving one at a time.
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = "gevent"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 1000
+keepalive = 5
+
+# dashboard_server.py monkey-patches blocking I/O at import when this is set
+raw_env = ["GEVENT=1"]
@@ -0,0 +1,47 @@
+import logging
+import orjson
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "metadata"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as one JSON object per line.
+
+    The metadata object collects extra={"metadata": {...}} as well as any
+    plain extra={...} keys, and is empty when neither is given. Tracebacks
+    go in exc_info. Nothing is serialized unless a handler actually emits
+    the record.
+    """
+
+    def format(self, record):
+        metadata = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+        extra_metadata = getattr(record, "metadata", None)
+        if isinstance(extra_metadata, dict):
+            metadata.update(extra_metadata)
+        elif extra_metadata is not None:
+            # Keep a non-dict metadata value rather than failing the whole record
+            metadata["metadata"] = extra_metadata
+        
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "component": record.name,
+            "message": record.getMessage(),
+            "metadata": metadata
+        }
+        # Tracebacks from logger.exception(), cached on the record as
+        # logging.Formatter does
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry, default=str).decode()
+
+def json_log_handler():
+    """Return a stream handler that writes JSON log lines."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter())
+    return handler
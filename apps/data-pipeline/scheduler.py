@@ -6,6 +6,7 @@ import schedule
 import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from supabase import create_client
 
 # Import all the data processors
 import market_data_fetcher
@@ -51,6 +52,9 @@ class Scheduler:
         # Get API base URL from environment or use default
         self.api_base_url = os.getenv("API_BASE_URL", "http://localhost:3000")
         
+        # Supabase client for database maintenance jobs, created on first use
+        self.supabase = None
+        
         logger.info(f"Scheduler initialized with {len(self.tickers)} tickers and user type: {self.user_type}", 
                    extra={"metadata": {"tickers": self.tickers, "user_type": self.user_type}})
     
@@ -104,7 +108,6 @@ class Scheduler:
             logger.info("Starting dark pool processor job", extra={"metadata": {}})
             processor = dark_pool_processor.DarkPoolProcessor()
             await processor.run(self.tickers)
-            processor.close()
             logger.info("Completed dark pool processor job", extra={"metadata": {}})
         except Exception as e:
             logger.error(f"Error in dark pool processor job: {e}", extra={"metadata": {}})
@@ -141,12 +144,12 @@ class Scheduler:
         except Exception as e:
             logger.error(f"Error in fundamental analyzer job: {e}", extra={"metadata": {}})
     
-    def run_economic_indicator_fetcher(self):
-        """Run the economic indicator fetcher (synchronous)."""
+    async def run_economic_indicator_fetcher(self):
+        """Run the economic indicator fetcher."""
         try:
             logger.info("Starting economic indicator fetcher job", extra={"metadata": {}})
             fetcher = economic_indicator_fetcher.EconomicIndicatorFetcher()
-            fetcher.run()
+            await fetcher.run_async()
             logger.info("Completed economic indicator fetcher job", extra={"metadata": {}})
         except Exception as e:
             logger.error(f"Error in economic indicator fetcher job: {e}", extra={"metadata": {}})
@@ -220,6 +223,16 @@ class Scheduler:
         except Exception as e:
             logger.error(f"Error in daily newsletter job: {e}", extra={"metadata": {}})
     
+    def refresh_dashboard_summary(self):
+        """Refresh the precomputed dashboard summary view."""
+        try:
+            if self.supabase is None:
+                self.supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+            self.supabase.rpc("refresh_dashboard_summary", {}).execute()
+            logger.info("Refreshed dashboard summary", extra={"metadata": {}})
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard summary: {e}", extra={"metadata": {}})
+    
     def schedule_jobs(self):
         """Schedule all data pipeline jobs based on user type."""
         if self.user_type == "trader" or self.user_type == "both":
@@ -238,11 +251,14 @@ class Scheduler:
             schedule.every(4).hours.do(self._run_async_job, self.run_sec_edgar)
             schedule.every(4).hours.do(self._run_async_job, self.run_holdings_change_detector)
             schedule.every(12).hours.do(self.run_fundamental_analyzer)
-            schedule.every(6).hours.do(self.run_economic_indicator_fetcher)
+            schedule.every(6).hours.do(self._run_async_job, self.run_economic_indicator_fetcher)
             schedule.every(4).hours.do(self.run_economic_report_fetcher)
             schedule.every(12).hours.do(self.run_interview_processor)
             logger.info("Investor data jobs scheduled", extra={"metadata": {}})
         
+        # Keep the dashboard summary view close to the underlying data
+        schedule.every(5).minutes.do(self.refresh_dashboard_summary)
+        
         # Schedule newsletters
         schedule.every().monday.at("08:00").do(self.run_weekly_newsletter)
         logger.info("Weekly newsletter job scheduled for Monday at 8 AM", extra={"metadata": {}})
@@ -282,7 +298,8 @@ class Scheduler:
             tasks.extend([
                 self.run_market_data_investor(),
                 self.run_sec_edgar(),
-                self.run_holdings_change_detector()
+                self.run_holdings_change_detector(),
+                self.run_economic_indicator_fetcher()
             ])
         
         await asyncio.gather(*tasks)
@@ -290,12 +307,13 @@ class Scheduler:
         # Run synchronous tasks
         if self.user_type == "investor" or self.user_type == "both":
             self.run_fundamental_analyzer()
-            self.run_economic_indicator_fetcher()
             self.run_economic_report_fetcher()
             self.run_interview_processor()
         elif self.user_type == "trader":
             self.run_economic_report_fetcher()
         
+        self.refresh_dashboard_summary()
+        
         # Don't run the weekly newsletter on startup - it should only run on schedule
         
         logger.info("Completed running all jobs", extra={"metadata": {}})
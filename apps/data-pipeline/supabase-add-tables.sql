@@ -23,6 +23,22 @@ CREATE INDEX IF NOT EXISTS idx_analyst_ratings_firm ON public.analyst_ratings(fi
 CREATE INDEX IF NOT EXISTS idx_analyst_ratings_rating_date ON public.analyst_ratings(rating_date);
 CREATE INDEX IF NOT EXISTS idx_analyst_ratings_rating_change ON public.analyst_ratings(rating_change);
 
+-- Covering index so recent-window reads of the rating keys are index-only scans
+CREATE INDEX IF NOT EXISTS idx_analyst_ratings_rating_date_covering ON public.analyst_ratings(rating_date DESC) INCLUDE (symbol, firm, rating_change);
+
+-- Remove duplicate ratings stored before the unique key existed, keeping the
+-- row with the lowest id of each, so the index below can be built
+DELETE FROM public.analyst_ratings a
+USING public.analyst_ratings b
+WHERE a.symbol = b.symbol
+  AND a.firm = b.firm
+  AND a.rating_date = b.rating_date
+  AND a.rating_change = b.rating_change
+  AND a.id > b.id;
+
+-- Unique key used by the fetcher's upsert (ON CONFLICT DO NOTHING) for deduplication
+CREATE UNIQUE INDEX IF NOT EXISTS idx_analyst_ratings_dedup ON public.analyst_ratings(symbol, firm, rating_date, rating_change);
+
 -- Enable Row Level Security for analyst_ratings
 ALTER TABLE public.analyst_ratings ENABLE ROW LEVEL SECURITY;
 
@@ -0,0 +1,132 @@
+import abc
+import asyncio
+import functools
+import logging
+import os
+import weakref
+from collections import defaultdict
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_WAIT_MS = 50
+
+@functools.lru_cache(maxsize=1)
+def _default_client() -> Client:
+    """Return the Supabase client used by batchers not given one, created on first use."""
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+class AsyncBatcher(abc.ABC):
+    """
+    Coalesce items submitted concurrently into batches.
+
+    Each call to process() waits until its item has been handled as part of a
+    batch, which is flushed once max_batch_size items are pending or
+    max_wait_ms after the first one arrived. Subclasses implement
+    process_batch(), returning one result (or exception) per item.
+    """
+
+    def __init__(self, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    async def process(self, item):
+        """Submit an item and wait for the result of its batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    @abc.abstractmethod
+    async def process_batch(self, items):
+        """Handle a batch of items and return a result or exception for each."""
+
+    def _flush(self):
+        """Hand the pending items to process_batch as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        """Run process_batch and resolve each submitter's future."""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+class SupabaseUpsertBatcher(AsyncBatcher):
+    """
+    Batch Supabase upserts into one request per table.
+
+    Items are (table, on_conflict, row) tuples. Without a client, a shared
+    one is created when the first batch is written.
+    """
+
+    def __init__(self, client=None, **kwargs):
+        super().__init__(**kwargs)
+        self._client = client
+
+    async def process_batch(self, items):
+        groups = defaultdict(list)
+        for index, (table, on_conflict, row) in enumerate(items):
+            groups[(table, on_conflict)].append((index, row))
+
+        client = self._client or _default_client()
+        results = [None] * len(items)
+        for (table, on_conflict), entries in groups.items():
+            # Keep the last row per conflict key, since a single upsert
+            # can't touch the same row twice
+            key_columns = on_conflict.split(",")
+            rows = list({tuple(row.get(column) for column in key_columns): row for _, row in entries}.values())
+
+            try:
+                await asyncio.to_thread(client.table(table).upsert(rows, on_conflict=on_conflict).execute)
+                logger.info(f"Upserted {len(rows)} rows into {table}",
+                           extra={"metadata": {"table": table, "count": len(rows)}})
+            except Exception as e:
+                logger.error(f"Error upserting batch into {table}: {e}",
+                            extra={"metadata": {"table": table, "count": len(rows)}})
+                for index, _ in entries:
+                    results[index] = e
+
+        return results
+
+# One batcher per event loop, shared by every processor running in it
+_upsert_batchers = weakref.WeakKeyDictionary()
+
+def get_upsert_batcher():
+    """Return the Supabase upsert batcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    batcher = _upsert_batchers.get(loop)
+    if batcher is None:
+        batcher = _upsert_batchers[loop] = SupabaseUpsertBatcher()
+    return batcher
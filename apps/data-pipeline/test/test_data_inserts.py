@@ -229,7 +229,7 @@ async def test_economic_indicator_inserts():
         
         # Test fetching GDP data
         print("\nFetching GDP data...")
-        gdp_data = fetcher.fetch_gdp()
+        gdp_data = await fetcher.fetch_av_series("gdp")
         
         if not gdp_data:
             print("❌ Failed to fetch GDP data")
@@ -240,7 +240,7 @@ async def test_economic_indicator_inserts():
         
         # Test fetching inflation data
         print("\nFetching inflation data...")
-        inflation_data = fetcher.fetch_inflation()
+        inflation_data = await fetcher.fetch_av_series("inflation")
         
         if not inflation_data:
             print("❌ Failed to fetch inflation data")
@@ -251,7 +251,7 @@ async def test_economic_indicator_inserts():
         
         # Test fetching unemployment data
         print("\nFetching unemployment data...")
-        unemployment_data = fetcher.fetch_unemployment()
+        unemployment_data = await fetcher.fetch_av_series("unemployment")
         
         if not unemployment_data:
             print("❌ Failed to fetch unemployment data")
@@ -261,7 +261,7 @@ async def test_economic_indicator_inserts():
             print(f"  Date: {unemployment_data.get('date', 'N/A')}")
         
         # Collect all indicators
-        indicators = fetcher.fetch_fred_indicators()
+        indicators = await fetcher.fetch_fred_indicators()
         
         if not indicators or len(indicators) == 0:
             print("❌ Failed to fetch economic indicators")
@@ -290,7 +290,7 @@ async def test_economic_indicator_inserts():
         # Test fetching and inserting economic news (if the table exists)
         if check_table_exists(ECONOMIC_NEWS_TABLE):
             print("\nFetching economic news...")
-            news = fetcher.fetch_economic_news()
+            news = await fetcher.fetch_economic_news()
             
             if not news or len(news) == 0:
                 print("❌ Failed to fetch economic news")
@@ -313,6 +313,7 @@ async def test_economic_indicator_inserts():
                 else:
                     print(f"❌ Failed to insert economic news")
         
+        await fetcher.close()
         return True
             
     except Exception as e:
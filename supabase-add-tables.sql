@@ -11,12 +11,19 @@ CREATE TABLE IF NOT EXISTS public.bank_reports (
     metrics JSONB, -- e.g., {"revenue": 1000000000, "eps": 2.5}
     summary TEXT,
     file_url TEXT,
+    source_url TEXT, -- URL the PDF was downloaded from, used to skip known reports
+    content_sha256 TEXT, -- SHA-256 of the source PDF, used to skip duplicates
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
+ALTER TABLE public.bank_reports ADD COLUMN IF NOT EXISTS content_sha256 TEXT;
+ALTER TABLE public.bank_reports ADD COLUMN IF NOT EXISTS source_url TEXT;
+
 CREATE INDEX IF NOT EXISTS bank_reports_bank_name_idx ON public.bank_reports(bank_name);
 CREATE INDEX IF NOT EXISTS bank_reports_report_date_idx ON public.bank_reports(report_date);
+CREATE INDEX IF NOT EXISTS bank_reports_content_sha256_idx ON public.bank_reports(content_sha256);
+CREATE INDEX IF NOT EXISTS bank_reports_source_url_idx ON public.bank_reports(source_url);
 
 -- YouTube Videos (if needed beyond the interviews table)
 CREATE TABLE IF NOT EXISTS public.youtube_videos (